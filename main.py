@@ -1,126 +1,252 @@
 """PTE Agent CLI."""
 
-import json
+import asyncio
 import logging
+import os
 import sys
+from collections import deque
 from datetime import datetime
+from zoneinfo import ZoneInfo
 
-import pytz
+import orjson
 
 from src.pte.graph import get_pte_graph
+from src.pte.nodes.final_answer import format_conversation_history
+from src.pte.schemas import set_allowed_tools
 from src.pte.state import PTEState
 from src.pte.tool_groups import get_tool_manifest_text, get_available_tools
 
+logger = logging.getLogger(__name__)
+
+# verbose 모드에서 도구 출력 최대 표시 길이 (대용량 RAG 결과 등)
+MAX_LOGGED_OUTPUT_CHARS = 2000
+
+# 턴마다 동일한 컨텍스트 (프로세스당 1회만 계산)
+_TOOL_MANIFEST = get_tool_manifest_text()
+_AVAILABLE_TOOLS = get_available_tools()
+set_allowed_tools(_AVAILABLE_TOOLS)
+
+
+_KST = ZoneInfo("Asia/Seoul")
+
+# 분 단위 포맷이므로 같은 분 안에서는 이전 문자열 재사용
+_last_minute: tuple[int, int, int, int, int] | None = None
+_last_datetime_str = ""
+
 
 def get_current_datetime_str() -> str:
     """현재 날짜/시간 문자열 반환 (KST)."""
-    kst = pytz.timezone("Asia/Seoul")
-    now = datetime.now(kst)
-    return now.strftime("%Y년 %m월 %d일 %H시 %M분 (%A, KST)")
+    global _last_minute, _last_datetime_str
+    now = datetime.now(_KST)
+    minute = (now.year, now.month, now.day, now.hour, now.minute)
+    if minute != _last_minute:
+        _last_minute = minute
+        _last_datetime_str = now.strftime("%Y년 %m월 %d일 %H시 %M분 (%A, KST)")
+    return _last_datetime_str
 
 
-def run_agent(
+def _build_initial_state(
     user_input: str,
     messages: list[dict[str, str]],
     previous_rewritten_query: str | None = None,
-    verbose: bool = False,
-) -> tuple[str, str | None]:
-    """에이전트 실행.
-
-    Args:
-        user_input: 사용자 입력
-        messages: 대화 히스토리
-        previous_rewritten_query: 이전 턴의 재작성된 쿼리 (맥락 유지용)
-        verbose: 상세 로그 출력 여부
-
-    Returns:
-        Tuple of (최종 결과, 현재 턴의 rewritten_query)
-    """
-    graph = get_pte_graph()
-
+) -> PTEState:
+    """한 턴의 초기 상태 생성."""
     # 컨텍스트 주입
     current_datetime = get_current_datetime_str()
-    tool_manifest = get_tool_manifest_text()
-    available_tools = get_available_tools()
 
-    initial_state: PTEState = {
+    return {
         "input": user_input,
         "messages": messages,
+        "conversation_history": format_conversation_history(messages),
         "previous_rewritten_query": previous_rewritten_query,
         "current_datetime": current_datetime,
-        "tool_manifest": tool_manifest,
-        "available_tools": available_tools,
+        "tool_manifest": _TOOL_MANIFEST,
+        "available_tools": _AVAILABLE_TOOLS,
         # Intent Classifier 결과 (초기값)
         "intent": "",
         "rewritten_query": "",
         "needs_tool": True,
         "time_sensitive": "none",
         # 계획 및 실행
+        "speculative_plan": None,
         "plan": [],
         "past_steps": [],
+        "past_steps_by_id": {},
         "replan_count": 0,
         "error": None,
         "result": None,
     }
 
+
+def _log_node_output(node_name: str, node_output: dict, printed_steps: int) -> int:
+    """verbose 모드에서 노드 출력 요약을 로그로 출력.
+
+    Args:
+        node_name: 노드 이름
+        node_output: 노드가 반환한 상태 업데이트
+        printed_steps: 이미 출력한 past_steps 수
+
+    Returns:
+        출력 후 past_steps 수
+    """
+    logger.info("\n%s\n📍 Node: %s\n%s", "─" * 40, node_name, "─" * 40)
+
+    # Intent Classifier 결과 출력
+    if node_name == "intent_classifier":
+        logger.info("🎯 Intent: %s", node_output.get("intent", ""))
+        logger.info("   Rewritten Query: %s", node_output.get("rewritten_query", ""))
+        logger.info("   Needs Tool: %s", node_output.get("needs_tool", True))
+
+    # Plan 출력 (planner/replanner 노드에서)
+    if node_name in ("planner", "replanner", "speculation_join") and "plan" in node_output:
+        logger.info("📋 Plan:")
+        if node_output["plan"]:
+            logger.info(orjson.dumps(node_output["plan"], option=orjson.OPT_INDENT_2).decode())
+        else:
+            logger.info("   (도구 실행 불필요 - 일반 대화)")
+
+    # 실행 결과 출력 (병렬 실행 시 여러 step이 한 번에 추가됨)
+    if "past_steps" in node_output:
+        past_steps = node_output["past_steps"]
+        if len(past_steps) < printed_steps:
+            printed_steps = 0  # planner가 새 계획으로 초기화
+        for step_result in past_steps[printed_steps:]:
+            status_icon = "✅" if step_result["status"] == "success" else "❌"
+            logger.info("🔧 Executed: %s %s", step_result["step"].get("tool"), status_icon)
+            output_str = str(step_result.get("output") or "")
+            if len(output_str) > MAX_LOGGED_OUTPUT_CHARS:
+                output_str = output_str[:MAX_LOGGED_OUTPUT_CHARS] + "... (생략)"
+            logger.info("   Output:\n%s", output_str)
+        printed_steps = len(past_steps)
+
+    # 에러 출력
+    if node_output.get("error"):
+        logger.info("⚠️  Error: %s", node_output["error"])
+
+    # 최종 결과 출력
+    if node_output.get("result"):
+        logger.info("💬 Result: %s...", str(node_output["result"])[:100])
+
+    return printed_steps
+
+
+async def run_agent(
+    user_input: str,
+    messages: list[dict[str, str]],
+    previous_rewritten_query: str | None = None,
+    verbose: bool = False,
+    stream: bool = False,
+) -> tuple[str, str | None]:
+    """에이전트 실행.
+
+    Args:
+        user_input: 사용자 입력
+        messages: 대화 히스토리
+        previous_rewritten_query: 이전 턴의 재작성된 쿼리 (맥락 유지용)
+        verbose: 상세 로그 출력 여부
+        stream: 최종 답변 토큰을 생성되는 즉시 출력 (verbose가 아닐 때만 적용,
+            결과는 run_agent 안에서 출력됨)
+
+    Returns:
+        Tuple of (최종 결과, 현재 턴의 rewritten_query)
+    """
+    graph = get_pte_graph()
+    initial_state = _build_initial_state(user_input, messages, previous_rewritten_query)
+
     if verbose:
         # 스트리밍 모드: 각 노드 실행 과정 출력
         final_state = None
-        for event in graph.stream(initial_state):
+        printed_steps = 0  # 이미 출력한 past_steps 수
+        async for event in graph.astream(initial_state):
             for node_name, node_output in event.items():
-                print(f"\n{'─' * 40}")
-                print(f"📍 Node: {node_name}")
-                print(f"{'─' * 40}")
-
-                # Intent Classifier 결과 출력
-                if node_name == "intent_classifier":
-                    intent = node_output.get("intent", "")
-                    rewritten = node_output.get("rewritten_query", "")
-                    needs_tool = node_output.get("needs_tool", True)
-                    print(f"🎯 Intent: {intent}")
-                    print(f"   Rewritten Query: {rewritten}")
-                    print(f"   Needs Tool: {needs_tool}")
-
-                # Plan 출력 (planner/replanner 노드에서)
-                if node_name in ("planner", "replanner") and "plan" in node_output:
-                    print("📋 Plan:")
-                    if node_output["plan"]:
-                        print(json.dumps(node_output["plan"], indent=2, ensure_ascii=False))
-                    else:
-                        print("   (도구 실행 불필요 - 일반 대화)")
-
-                # 실행 결과 출력
-                if "past_steps" in node_output and node_output["past_steps"]:
-                    last_step = node_output["past_steps"][-1]
-                    status_icon = "✅" if last_step["status"] == "success" else "❌"
-                    tool_name = last_step['step'].get('tool')
-                    print(f"🔧 Executed: {tool_name} {status_icon}")
-                    output_str = str(last_step.get('output') or '')
-                    print(f"   Output:\n{output_str}")
-
-                # 에러 출력
-                if node_output.get("error"):
-                    print(f"⚠️  Error: {node_output['error']}")
-
-                # 최종 결과 출력
-                if node_output.get("result"):
-                    result_str = str(node_output['result'])[:100]
-                    print(f"💬 Result: {result_str}...")
-
+                if logger.isEnabledFor(logging.INFO):
+                    printed_steps = _log_node_output(node_name, node_output, printed_steps)
                 final_state = node_output
 
-        print(f"\n{'═' * 40}\n")
+        logger.info("\n%s\n", "═" * 40)
         result = final_state.get("result", "결과를 생성하지 못했습니다.") if final_state else "결과 없음"
         rewritten = final_state.get("rewritten_query") if final_state else None
         return result, rewritten
+    elif stream:
+        # 토큰 스트리밍 모드: final_answer 노드의 LLM 토큰을 도착 즉시 출력
+        final_state = initial_state
+        streamed = False
+        async for mode, payload in graph.astream(
+            initial_state, stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                final_state = payload
+                continue
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") != "final_answer" or not chunk.content:
+                continue
+            if not streamed:
+                print("Agent: ", end="", flush=True)
+                streamed = True
+            print(chunk.content, end="", flush=True)
+
+        result = final_state.get("result") or "결과를 생성하지 못했습니다."
+        if streamed:
+            print()
+        else:
+            # LLM을 거치지 않은 결과 (error_handler 등)
+            print(f"Agent: {result}")
+        rewritten = final_state.get("rewritten_query")
+        return result, rewritten
     else:
         # 일반 모드
-        final_state = graph.invoke(initial_state)
+        final_state = await graph.ainvoke(initial_state)
         result = final_state.get("result", "결과를 생성하지 못했습니다.")
         rewritten = final_state.get("rewritten_query")
         return result, rewritten
 
 
+async def run_agent_batch(
+    user_inputs: list[str],
+    max_concurrency: int = 8,
+) -> list[tuple[str, str | None]]:
+    """서로 독립적인 여러 질문을 동시에 실행 (평가/스크립트용).
+
+    각 질문은 빈 대화 히스토리로 처리되며, LLM/도구 호출이 질문 간에 겹쳐 실행된다.
+
+    Args:
+        user_inputs: 사용자 입력 목록
+        max_concurrency: 동시에 실행할 최대 그래프 수
+
+    Returns:
+        입력 순서대로 (최종 결과, rewritten_query) 목록
+    """
+    graph = get_pte_graph()
+    states = [_build_initial_state(user_input, []) for user_input in user_inputs]
+
+    final_states = await graph.abatch(
+        states,
+        config={"max_concurrency": max_concurrency},
+        return_exceptions=True,
+    )
+
+    results = []
+    for final_state in final_states:
+        if isinstance(final_state, Exception):
+            results.append((f"오류 발생: {final_state}", None))
+        else:
+            result = final_state.get("result") or "결과를 생성하지 못했습니다."
+            results.append((result, final_state.get("rewritten_query")))
+    return results
+
+
+async def _run_batch_file(path: str) -> None:
+    """파일의 각 줄을 질문으로 보고 배치 실행 후 결과 출력."""
+    with open(path, encoding="utf-8") as f:
+        user_inputs = [line.strip() for line in f if line.strip()]
+
+    results = await run_agent_batch(user_inputs)
+    for user_input, (result, _) in zip(user_inputs, results):
+        print(f"You: {user_input}")
+        print(f"Agent: {result}")
+        print()
+
+
 def setup_logging(verbose: bool):
     """로깅 설정."""
     level = logging.INFO if verbose else logging.WARNING
@@ -128,13 +254,80 @@ def setup_logging(verbose: bool):
         level=level,
         format="%(message)s",
         handlers=[logging.StreamHandler(sys.stdout)],
+        force=True,  # /verbose 토글 시 재설정
     )
     # httpx 로그 비활성화 (HTTP Request: POST ... 메시지)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
 
 
-def main():
+# stdin에서 읽었지만 아직 반환하지 않은 줄 (여러 줄을 한 번에 붙여넣은 경우)
+_stdin_lines: deque[str] = deque()
+_stdin_partial = bytearray()
+_stdin_eof = False
+
+
+def _feed_stdin(chunk: bytes) -> None:
+    """os.read로 읽은 바이트를 완성된 줄 단위로 _stdin_lines에 추가."""
+    global _stdin_eof
+    encoding = sys.stdin.encoding or "utf-8"
+    if not chunk:
+        _stdin_eof = True
+        if _stdin_partial:
+            _stdin_lines.append(_stdin_partial.decode(encoding, errors="replace"))
+            _stdin_partial.clear()
+        return
+    _stdin_partial.extend(chunk)
+    *complete, rest = _stdin_partial.split(b"\n")
+    for line in complete:
+        _stdin_lines.append(line.decode(encoding, errors="replace").rstrip("\r"))
+    _stdin_partial[:] = rest
+
+
+async def _ainput(prompt: str) -> str:
+    """이벤트 루프를 막지 않고 stdin에서 한 줄 읽기.
+
+    stdin이 읽기 가능해질 때 이벤트 루프가 깨우므로 대기 중에도 다른 작업이 진행되고,
+    Ctrl+C 시 블로킹된 스레드가 종료를 붙잡지 않는다.
+    fd에서 직접 읽어 버퍼링하므로 여러 줄을 붙여넣어도 남은 줄이 다음 호출에서 바로 반환된다.
+
+    Raises:
+        EOFError: stdin이 닫힘
+    """
+    print(prompt, end="", flush=True)
+    if _stdin_lines:
+        return _stdin_lines.popleft()
+    if _stdin_eof:
+        raise EOFError
+
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+    fd = sys.stdin.fileno()
+
+    def _on_readable() -> None:
+        _feed_stdin(os.read(fd, 65536))
+        if future.done():
+            return
+        if _stdin_lines:
+            future.set_result(_stdin_lines.popleft())
+        elif _stdin_eof:
+            future.set_exception(EOFError())
+
+    try:
+        loop.add_reader(fd, _on_readable)
+    except (NotImplementedError, PermissionError):
+        # add_reader 미지원 루프(Windows Proactor) 또는 poll할 수 없는 stdin(파일 리다이렉트)
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            raise EOFError
+        return line.rstrip("\n")
+    try:
+        return await future
+    finally:
+        loop.remove_reader(fd)
+
+
+async def main():
     """CLI 메인 함수."""
     # --verbose 또는 -v 플래그 확인
     verbose = "--verbose" in sys.argv or "-v" in sys.argv
@@ -142,6 +335,15 @@ def main():
     # 로깅 설정
     setup_logging(verbose)
 
+    # --batch <file>: 파일의 질문들을 한 번에 실행하고 종료
+    if "--batch" in sys.argv:
+        idx = sys.argv.index("--batch")
+        if idx + 1 >= len(sys.argv):
+            print("사용법: python main.py --batch <질문 파일>")
+            return
+        await _run_batch_file(sys.argv[idx + 1])
+        return
+
     # 대화 히스토리
     conversation_history: list[dict[str, str]] = []
     # 이전 턴의 재작성된 쿼리 (맥락 유지용)
@@ -158,7 +360,7 @@ def main():
 
     while True:
         try:
-            user_input = input("You: ").strip()
+            user_input = (await _ainput("You: ")).strip()
 
             if not user_input:
                 continue
@@ -170,6 +372,7 @@ def main():
             # /verbose 명령으로 토글
             if user_input.lower() == "/verbose":
                 verbose = not verbose
+                setup_logging(verbose)
                 print(f"Verbose mode: {'ON' if verbose else 'OFF'}")
                 continue
 
@@ -181,11 +384,12 @@ def main():
                 continue
 
             print("\n[처리 중...]\n")
-            result, current_rewritten = run_agent(
+            result, current_rewritten = await run_agent(
                 user_input,
                 conversation_history,
                 previous_rewritten_query=previous_rewritten_query,
                 verbose=verbose,
+                stream=not verbose,
             )
 
             # 대화 히스토리에 추가
@@ -195,10 +399,12 @@ def main():
             # 다음 턴을 위해 rewritten_query 저장
             previous_rewritten_query = current_rewritten
 
-            print(f"Agent: {result}")
+            # 스트리밍 모드에서는 run_agent가 이미 출력함
+            if verbose:
+                print(f"Agent: {result}")
             print()
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError, asyncio.CancelledError):
             print("\n\nGoodbye!")
             break
         except Exception as e:
@@ -206,4 +412,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Cache package."""
+
+from src.config import settings
+
+from .base import CacheBackend, CacheEntry, CacheStats
+from .memory import MemoryCache
+from .semantic import SemanticCache
+from .sqlite_cache import SQLiteCache
+from .keys import (
+    embedding_cache_key,
+    llm_response_cache_key,
+    query_enhancement_cache_key,
+    tool_result_cache_key,
+    wikipedia_cache_key,
+)
+
+_caches: dict[str, CacheBackend] = {}
+_semantic_caches: dict[str, SemanticCache] = {}
+_disk_caches: dict[str, SQLiteCache] = {}
+
+
+def get_cache(name: str) -> CacheBackend:
+    """이름별 캐시 싱글톤 반환."""
+    if name not in _caches:
+        _caches[name] = _create_cache(name)
+    return _caches[name]
+
+
+def get_semantic_cache(name: str) -> SemanticCache:
+    """이름별 시맨틱 캐시 싱글톤 반환 (항상 프로세스 로컬)."""
+    if name not in _semantic_caches:
+        _semantic_caches[name] = SemanticCache(threshold=settings.cache_semantic_threshold)
+    return _semantic_caches[name]
+
+
+def get_disk_cache(name: str) -> CacheBackend | None:
+    """이름별 디스크 캐시 싱글톤 반환 (CACHE_DISK_PATH 미설정 또는 redis 백엔드면 None).
+
+    redis는 이미 프로세스 밖에 유지되므로 메모리 백엔드일 때만 2단계 캐시로 사용한다.
+    """
+    if not settings.cache_disk_path or settings.cache_backend == "redis":
+        return None
+    if name not in _disk_caches:
+        config = {
+            "wikipedia": {"default_ttl_seconds": settings.cache_wikipedia_disk_ttl, "max_size": 25000},
+        }
+        _disk_caches[name] = SQLiteCache(settings.cache_disk_path, namespace=name, **config.get(name, {}))
+    return _disk_caches[name]
+
+
+def _create_cache(name: str) -> CacheBackend:
+    config = {
+        "intent": {"default_ttl_seconds": settings.cache_intent_ttl, "max_size": 1000},
+        "tool_result": {"default_ttl_seconds": settings.cache_tool_result_ttl, "max_size": 512},
+        "embedding": {"default_ttl_seconds": settings.cache_embedding_ttl, "max_size": 10000},
+        "query_enhancement": {
+            "default_ttl_seconds": settings.cache_query_enhancement_ttl,
+            "max_size": 1024,
+        },
+        "wikipedia": {"default_ttl_seconds": settings.cache_wikipedia_ttl, "max_size": 512},
+    }
+    if settings.cache_backend == "redis":
+        from .redis_cache import RedisCache
+
+        return RedisCache(settings.redis_url, namespace=name, **config.get(name, {}))
+    return MemoryCache(**config.get(name, {}))
+
+
+__all__ = [
+    "CacheBackend",
+    "CacheEntry",
+    "CacheStats",
+    "MemoryCache",
+    "SemanticCache",
+    "SQLiteCache",
+    "get_cache",
+    "get_disk_cache",
+    "get_semantic_cache",
+    "embedding_cache_key",
+    "llm_response_cache_key",
+    "query_enhancement_cache_key",
+    "tool_result_cache_key",
+    "wikipedia_cache_key",
+]
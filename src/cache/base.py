@@ -0,0 +1,61 @@
+"""캐시 추상 인터페이스."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CacheEntry(Generic[T]):
+    """캐시 항목 (값 + 생성 시각 + TTL)."""
+
+    value: T
+    created_at: datetime
+    ttl_seconds: int | None = None
+
+    def is_expired(self) -> bool:
+        """TTL 만료 여부."""
+        if self.ttl_seconds is None:
+            return False
+        elapsed = (datetime.now() - self.created_at).total_seconds()
+        return elapsed > self.ttl_seconds
+
+
+@dataclass
+class CacheStats:
+    """캐시 통계."""
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (조회가 없으면 0.0)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheBackend(ABC, Generic[T]):
+    """캐시 백엔드 인터페이스."""
+
+    @abstractmethod
+    def get(self, key: str) -> T | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: T, ttl_seconds: int | None = None) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def get_stats(self) -> CacheStats: ...
@@ -0,0 +1,104 @@
+"""캐시 키 생성 함수."""
+
+import hashlib
+import json
+from typing import Any
+
+import xxhash
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _hash_value(value: str, length: int = 16) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()[:length]
+
+
+def _history_fingerprint(history: list[dict[str, str]] | None) -> str | None:
+    """히스토리 지문 (JSON 직렬화 없이 메시지를 순서대로 해시)."""
+    if history is None:
+        return None
+    h = xxhash.xxh3_128()
+    for msg in history:
+        h.update(str(msg.get("role", "")).encode())
+        h.update(b"\x00")
+        h.update(str(msg.get("content", "")).encode())
+        h.update(b"\x01")
+    return h.hexdigest()
+
+
+def embedding_cache_key(text: str) -> str:
+    """임베딩 캐시 키: emb:{hash}"""
+    normalized = _normalize_text(text)
+    return f"emb:{_hash_value(normalized)}"
+
+
+def llm_response_cache_key(model: str, prompt: str, temperature: float) -> str:
+    """LLM 응답 캐시 키: llm:{hash}"""
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "temperature": temperature},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return f"llm:{_hash_value(payload, 32)}"
+
+
+def tool_result_cache_key(
+    tool_name: str,
+    tool_input: Any,
+    context: str | None = None,
+    history: list[dict[str, str]] | None = None,
+    intent: str = "",
+    time_sensitive: str = "",
+) -> str:
+    """도구 결과 캐시 키: tool:{name}:{hash}
+
+    검색 도구는 context/history/intent에 따라 쿼리가 증강되므로 함께 키에 포함한다.
+    """
+    payload = json.dumps(
+        {
+            "input": tool_input,
+            "context": context,
+            "history": _history_fingerprint(history),
+            "intent": intent,
+            "time_sensitive": time_sensitive,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return f"tool:{tool_name}:{_hash_value(payload, 32)}"
+
+
+def query_enhancement_cache_key(
+    kind: str,
+    query: str,
+    context: str | None,
+    history_text: str = "",
+    intent: str = "",
+    time_sensitive: str = "",
+    year_hint: str = "",
+) -> str:
+    """쿼리 증강 캐시 키: qe:{kind}:{hash}
+
+    프롬프트에 들어가는 값만 키에 포함한다 (현재 시각은 분 단위로 바뀌므로 제외).
+    """
+    payload = json.dumps(
+        {
+            "query": query,
+            "context": context,
+            "history": history_text,
+            "intent": intent,
+            "time_sensitive": time_sensitive,
+            "year_hint": year_hint,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return f"qe:{kind}:{_hash_value(payload, 32)}"
+
+
+def wikipedia_cache_key(lang: str, query: str, sentences: int) -> str:
+    """Wikipedia 검색 결과 캐시 키: wiki:{lang}:{sentences}:{hash}"""
+    return f"wiki:{lang}:{sentences}:{_hash_value(query.strip(), 32)}"
@@ -0,0 +1,87 @@
+"""인메모리 캐시 구현."""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from .base import CacheBackend, CacheEntry, CacheStats, T
+
+
+class MemoryCache(CacheBackend[T]):
+    """Thread-safe 인메모리 캐시 (TTL + LRU eviction).
+
+    Args:
+        default_ttl_seconds: 기본 TTL (None이면 만료 없음)
+        max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+        cleanup_interval: set 호출 N회마다 만료 항목 정리
+    """
+
+    def __init__(
+        self,
+        default_ttl_seconds: int | None = 3600,
+        max_size: int = 1000,
+        cleanup_interval: int = 100,
+    ):
+        self._cache: OrderedDict[str, CacheEntry[T]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._default_ttl = default_ttl_seconds
+        self._max_size = max_size
+        self._cleanup_interval = cleanup_interval
+        self._set_count = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> T | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.is_expired():
+                del self._cache[key]
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)  # LRU 갱신
+            self._hits += 1
+            return entry.value
+
+    def set(self, key: str, value: T, ttl_seconds: int | None = None) -> None:
+        with self._lock:
+            self._cache[key] = CacheEntry(
+                value=value,
+                created_at=datetime.now(),
+                ttl_seconds=ttl_seconds if ttl_seconds is not None else self._default_ttl,
+            )
+            self._cache.move_to_end(key)
+
+            self._set_count += 1
+            if self._set_count % self._cleanup_interval == 0:
+                self._cleanup_expired()
+
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._cache.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            entry = self._cache.get(key)
+            return entry is not None and not entry.is_expired()
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses, size=len(self._cache))
+
+    def _cleanup_expired(self) -> None:
+        """만료된 항목 일괄 제거."""
+        expired = [key for key, entry in self._cache.items() if entry.is_expired()]
+        for key in expired:
+            del self._cache[key]
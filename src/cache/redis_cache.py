@@ -0,0 +1,67 @@
+"""Redis 캐시 구현 (여러 프로세스/인스턴스 간 캐시 공유용)."""
+
+import json
+
+from .base import CacheBackend, CacheStats, T
+
+
+class RedisCache(CacheBackend[T]):
+    """Redis 기반 캐시 (TTL은 Redis 만료 기능 사용).
+
+    값은 JSON으로 직렬화되므로 str/dict/list 등 JSON 호환 값만 저장한다.
+
+    Args:
+        url: Redis 접속 URL (예: redis://localhost:6379/0)
+        namespace: 키 prefix (캐시 이름별 분리)
+        default_ttl_seconds: 기본 TTL (None이면 만료 없음)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        namespace: str,
+        default_ttl_seconds: int | None = 3600,
+        **_: object,  # max_size 등 MemoryCache 전용 옵션 무시
+    ):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("redis 패키지가 설치되지 않았습니다. (pip install redis)") from e
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = f"pte:{namespace}:"
+        self._default_ttl = default_ttl_seconds
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, key: str) -> str:
+        return self._prefix + key
+
+    def get(self, key: str) -> T | None:
+        raw = self._client.get(self._key(key))
+        if raw is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: T, ttl_seconds: int | None = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self._default_ttl
+        self._client.set(self._key(key), json.dumps(value, ensure_ascii=False), ex=ttl)
+
+    def delete(self, key: str) -> bool:
+        return self._client.delete(self._key(key)) > 0
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=f"{self._prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+        self._hits = 0
+        self._misses = 0
+
+    def exists(self, key: str) -> bool:
+        return self._client.exists(self._key(key)) > 0
+
+    def get_stats(self) -> CacheStats:
+        size = sum(1 for _ in self._client.scan_iter(match=f"{self._prefix}*"))
+        return CacheStats(hits=self._hits, misses=self._misses, size=size)
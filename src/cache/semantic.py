@@ -0,0 +1,55 @@
+"""임베딩 유사도 기반 시맨틱 캐시."""
+
+import math
+import threading
+from collections import deque
+from operator import mul
+from typing import Generic
+
+from .base import T
+
+
+class SemanticCache(Generic[T]):
+    """의미가 거의 같은 입력에 대해 이전 결과를 재사용하는 캐시.
+
+    정규화된 임베딩과 값을 함께 저장하고, 조회 시 코사인 유사도가 임계값 이상인
+    가장 가까운 항목을 반환한다. 항목 수가 작으므로 순수 Python 내적으로 충분하다
+    (map(mul, ...)로 요소 곱을 C 레벨에서 처리).
+
+    Args:
+        threshold: 히트로 판단할 최소 코사인 유사도
+        max_size: 최대 항목 수 (초과 시 가장 오래된 항목 제거)
+    """
+
+    def __init__(self, threshold: float = 0.95, max_size: int = 500):
+        self._entries: deque[tuple[list[float], T]] = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+        self._threshold = threshold
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> list[float]:
+        norm = math.sqrt(sum(map(mul, vector, vector)))
+        return [x / norm for x in vector] if norm else vector
+
+    def get(self, embedding: list[float]) -> T | None:
+        """유사도가 임계값 이상인 가장 가까운 값 반환 (없으면 None)."""
+        query = self._normalize(embedding)
+        best_value, best_score = None, self._threshold
+        with self._lock:
+            for vector, value in self._entries:
+                score = sum(map(mul, query, vector))  # 내적을 C 레벨 루프로 계산
+                if score >= best_score:
+                    best_value, best_score = value, score
+        return best_value
+
+    def set(self, embedding: list[float], value: T) -> None:
+        """임베딩과 값 저장."""
+        with self._lock:
+            self._entries.append((self._normalize(embedding), value))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,123 @@
+"""SQLite 캐시 구현 (프로세스 재시작 후에도 유지되는 로컬 디스크 캐시)."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .base import CacheBackend, CacheStats, T
+
+
+class SQLiteCache(CacheBackend[T]):
+    """SQLite 파일 기반 캐시 (TTL + 오래된 항목부터 제거).
+
+    값은 JSON으로 직렬화되므로 str/dict/list 등 JSON 호환 값만 저장한다.
+    여러 캐시 이름이 같은 파일을 namespace로 나눠 쓴다.
+
+    Args:
+        path: SQLite 파일 경로 (상위 디렉터리가 없으면 생성)
+        namespace: 캐시 이름별 분리용 키
+        default_ttl_seconds: 기본 TTL (None이면 만료 없음)
+        max_size: namespace별 최대 항목 수 (초과 시 가장 먼저 저장된 항목 제거)
+        cleanup_interval: set 호출 N회마다 만료/초과 항목 정리
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        default_ttl_seconds: int | None = 86400,
+        max_size: int = 10000,
+        cleanup_interval: int = 100,
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._lock = threading.Lock()
+        self._namespace = namespace
+        self._default_ttl = default_ttl_seconds
+        self._max_size = max_size
+        self._cleanup_interval = cleanup_interval
+        self._set_count = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> T | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self._namespace, key),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?", (self._namespace, key)
+                )
+                self._misses += 1
+                return None
+            self._hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: T, ttl_seconds: int | None = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self._default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self._namespace, key, payload, expires_at),
+            )
+            self._set_count += 1
+            if self._set_count % self._cleanup_interval == 0:
+                self._cleanup()
+
+    def _cleanup(self) -> None:
+        """만료 항목 삭제 후 max_size 초과분을 오래된 순(rowid)으로 삭제."""
+        self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?",
+            (self._namespace, time.time()),
+        )
+        self._conn.execute(
+            "DELETE FROM cache WHERE rowid IN ("
+            " SELECT rowid FROM cache WHERE namespace = ? ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+            (self._namespace, self._max_size),
+        )
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?", (self._namespace, key)
+            )
+            return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self._namespace,))
+            self._hits = 0
+            self._misses = 0
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self._namespace, key),
+            ).fetchone()
+        return row is not None and (row[0] is None or row[0] > time.time())
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            (size,) = self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self._namespace,)
+            ).fetchone()
+            return CacheStats(hits=self._hits, misses=self._misses, size=size)
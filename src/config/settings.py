@@ -36,8 +36,69 @@ class Settings:
     planner_temperature: float = 0.0  # Planner needs deterministic output
     replanner_temperature: float = 0.0
 
+    # JSON Schema 기반 구조화 출력 (response_format 미지원 모델이면 false 유지)
+    structured_output: bool = field(
+        default_factory=lambda: os.getenv("STRUCTURED_OUTPUT", "false").lower() == "true"
+    )
+
     # PTE Settings
     max_replan_count: int = 3  # Maximum re-planning attempts
+    tool_concurrency_limit: int = field(
+        default_factory=lambda: int(os.getenv("TOOL_CONCURRENCY_LIMIT", "4"))
+    )  # 독립 step 동시 실행 수 (1 = 순차 실행)
+    python_repl_timeout: float = field(
+        default_factory=lambda: float(os.getenv("PYTHON_REPL_TIMEOUT", "30"))
+    )  # python_repl 코드 실행 제한 시간(초), 초과 시 워커 프로세스 재시작
+    speculative_planner: bool = field(
+        default_factory=lambda: os.getenv("SPECULATIVE_PLANNER", "false").lower() == "true"
+    )  # intent 분류와 planner를 병렬 실행 (chitchat이면 planner 호출이 낭비됨)
+    streaming_planner: bool = field(
+        default_factory=lambda: os.getenv("STREAMING_PLANNER", "false").lower() == "true"
+    )  # 계획 스트리밍 중 첫 step을 미리 실행 (LLM 디코딩과 도구 실행을 겹침)
+    wikipedia_prewarm: bool = field(
+        default_factory=lambda: os.getenv("WIKIPEDIA_PREWARM", "false").lower() == "true"
+    )  # 시작 시 ko/en Wikipedia에 미리 연결 (첫 검색의 TCP/TLS 핸드셰이크 제거)
+    query_enhance_cot: bool = field(
+        default_factory=lambda: os.getenv("QUERY_ENHANCE_COT", "false").lower() == "true"
+    )  # 새 질문 쿼리 증강에서도 추론(Core intent) 출력 + 로그 (디버깅용, 출력 토큰 증가)
+
+    # Cache Settings
+    cache_enabled: bool = field(
+        default_factory=lambda: os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    )
+    cache_backend: str = field(
+        default_factory=lambda: os.getenv("CACHE_BACKEND", "memory").lower()
+    )  # memory, redis
+    redis_url: str = field(
+        default_factory=lambda: os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    )
+    cache_intent_ttl: int = field(
+        default_factory=lambda: int(os.getenv("CACHE_INTENT_TTL", "3600"))  # 1시간
+    )
+    cache_tool_result_ttl: int = field(
+        default_factory=lambda: int(os.getenv("CACHE_TOOL_RESULT_TTL", "300"))  # 5분
+    )
+    cache_embedding_ttl: int = field(
+        default_factory=lambda: int(os.getenv("CACHE_EMBEDDING_TTL", "86400"))  # 24시간
+    )
+    cache_query_enhancement_ttl: int = field(
+        default_factory=lambda: int(os.getenv("CACHE_QUERY_ENHANCEMENT_TTL", "3600"))  # 1시간
+    )
+    cache_wikipedia_ttl: int = field(
+        default_factory=lambda: int(os.getenv("CACHE_WIKIPEDIA_TTL", "3600"))  # 1시간
+    )
+    cache_disk_path: str = field(
+        default_factory=lambda: os.getenv("CACHE_DISK_PATH", "")
+    )  # 비어 있지 않으면 메모리 캐시 아래 SQLite 디스크 캐시 사용 (재시작 후에도 유지)
+    cache_wikipedia_disk_ttl: int = field(
+        default_factory=lambda: int(os.getenv("CACHE_WIKIPEDIA_DISK_TTL", "86400"))  # 24시간
+    )
+    cache_semantic_enabled: bool = field(
+        default_factory=lambda: os.getenv("CACHE_SEMANTIC_ENABLED", "false").lower() == "true"
+    )  # 인사/잡담 분류, 검색 쿼리 증강의 의미 유사도 캐시 (임베딩 API 호출 필요)
+    cache_semantic_threshold: float = field(
+        default_factory=lambda: float(os.getenv("CACHE_SEMANTIC_THRESHOLD", "0.95"))
+    )
 
     # App metadata (for OpenRouter headers)
     app_name: str = "LangGraph PTE Agent"
@@ -1,5 +1,12 @@
 """LLM package."""
 
-from .openrouter import get_llm
+from .openrouter import get_llm, cached_system_message, invoke_structured, supports_prompt_cache
+from .embeddings import get_embedding
 
-__all__ = ["get_llm"]
+__all__ = [
+    "get_llm",
+    "cached_system_message",
+    "invoke_structured",
+    "supports_prompt_cache",
+    "get_embedding",
+]
@@ -0,0 +1,39 @@
+"""Embedding helpers (cached OpenRouter embeddings)."""
+
+from functools import lru_cache
+
+from src.cache import embedding_cache_key, get_cache
+from src.config import settings
+
+
+@lru_cache(maxsize=1)
+def _get_embeddings_client():
+    from langchain_openai import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(
+        base_url=settings.openrouter_base_url,
+        api_key=settings.openrouter_api_key,
+    )
+
+
+def get_embedding(text: str) -> list[float] | None:
+    """Return the embedding vector for text, or None on failure.
+
+    Results are stored in the "embedding" cache when caching is enabled,
+    since the same query text is frequently embedded more than once.
+    """
+    cache = get_cache("embedding") if settings.cache_enabled else None
+    key = embedding_cache_key(text)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    try:
+        vector = _get_embeddings_client().embed_query(text)
+    except Exception:
+        return None
+
+    if cache is not None:
+        cache.set(key, vector)
+    return vector
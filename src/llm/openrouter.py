@@ -1,9 +1,44 @@
 """OpenRouter LLM configuration."""
 
+import functools
+import importlib.util
+
+import httpx
+from langchain_core.messages import BaseMessage, SystemMessage
+from pydantic import BaseModel, ValidationError
 from langchain_openai import ChatOpenAI
 from src.config import settings
 
 
+# Shared HTTP connection pools (one per process, reused by every ChatOpenAI)
+_http_client: httpx.Client | None = None
+_http_async_client: httpx.AsyncClient | None = None
+
+# Concurrent tool steps and speculative calls can hit OpenRouter at once;
+# keep enough idle connections around that none of them re-handshakes.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+# Fail fast on connect, but never cut off a long streamed completion.
+_HTTP_TIMEOUT = httpx.Timeout(None, connect=5.0)
+
+
+def _get_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the shared sync/async HTTP clients, creating them on first use.
+
+    Without these, each ChatOpenAI builds its own client and pays a fresh
+    TCP/TLS handshake to OpenRouter on every node call. HTTP/2 is enabled
+    when the optional `h2` package is installed (pip install httpx[http2]),
+    so concurrent requests share one multiplexed connection.
+    """
+    global _http_client, _http_async_client
+    if _http_client is None:
+        http2 = importlib.util.find_spec("h2") is not None
+        _http_client = httpx.Client(http2=http2, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+        _http_async_client = httpx.AsyncClient(
+            http2=http2, limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT
+        )
+    return _http_client, _http_async_client
+
+
 def get_llm(
     model: str | None = None,
     temperature: float | None = None,
@@ -11,6 +46,9 @@ def get_llm(
 ) -> ChatOpenAI:
     """Get configured ChatOpenAI instance for OpenRouter.
 
+    Instances without extra kwargs are shared per (model, temperature), so
+    nodes reuse one client instead of rebuilding it on every call.
+
     Args:
         model: Model name (e.g., "anthropic/claude-sonnet-4")
         temperature: Sampling temperature
@@ -19,14 +57,105 @@ def get_llm(
     Returns:
         Configured ChatOpenAI instance
     """
+    model = model or settings.default_model
+    temperature = temperature if temperature is not None else settings.default_temperature
+    if not kwargs:
+        return _get_shared_llm(model, temperature)
+    return _create_llm(model, temperature, **kwargs)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_shared_llm(model: str, temperature: float) -> ChatOpenAI:
+    """Cached ChatOpenAI per (model, temperature)."""
+    return _create_llm(model, temperature)
+
+
+def _create_llm(model: str, temperature: float, **kwargs) -> ChatOpenAI:
+    """Build a new ChatOpenAI bound to the shared HTTP clients."""
+    http_client, http_async_client = _get_http_clients()
     return ChatOpenAI(
-        model=model or settings.default_model,
-        temperature=temperature if temperature is not None else settings.default_temperature,
+        model=model,
+        temperature=temperature,
         base_url=settings.openrouter_base_url,
         api_key=settings.openrouter_api_key,
         default_headers={
             "HTTP-Referer": settings.app_url,
             "X-Title": settings.app_name,
         },
+        http_client=http_client,
+        http_async_client=http_async_client,
         **kwargs,
     )
+
+
+def supports_prompt_cache(model: str | None = None) -> bool:
+    """Whether the model honors Anthropic-style `cache_control` markers."""
+    return (model or settings.default_model).startswith("anthropic/")
+
+
+def cached_system_message(
+    static: str,
+    dynamic: str = "",
+    model: str | None = None,
+) -> SystemMessage:
+    """Build a SystemMessage whose static prefix is marked for prompt caching.
+
+    OpenRouter passes `cache_control` content blocks through to Anthropic, which
+    then reuses the KV cache for the static prefix across calls. The dynamic
+    part is sent as a separate, uncached block after it.
+
+    Args:
+        static: Prompt text identical across calls (rules, examples)
+        dynamic: Per-call prompt text (user input, history, time)
+        model: Model name the message will be sent to
+
+    Returns:
+        SystemMessage with content blocks (or plain text for other providers)
+    """
+    if not supports_prompt_cache(model):
+        return SystemMessage(content=f"{static}\n\n{dynamic}" if dynamic else static)
+
+    blocks = [
+        {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+    ]
+    if dynamic:
+        blocks.append({"type": "text", "text": dynamic})
+    return SystemMessage(content=blocks)
+
+
+def invoke_structured(
+    llm: ChatOpenAI,
+    schema: type[BaseModel],
+    messages: list[BaseMessage],
+) -> tuple[BaseModel | None, str]:
+    """Invoke the model with JSON-schema constrained output.
+
+    The schema is sent as `response_format={"type": "json_schema", ...}` so
+    providers that support it decode directly into the schema. The raw text
+    is returned as well, so callers can fall back to their own parser when a
+    provider ignores the response format.
+
+    Args:
+        llm: Chat model to call
+        schema: Pydantic model describing the expected output
+        messages: Prompt messages
+
+    Returns:
+        Tuple of (validated schema instance or None, raw response text)
+    """
+    # Pass the JSON schema dict (not the class) so malformed output lands in
+    # "parsed=None" instead of raising inside the SDK's own parser.
+    structured_llm = llm.with_structured_output(
+        schema.model_json_schema(), method="json_schema", include_raw=True
+    )
+    output = structured_llm.invoke(messages)
+    raw = output["raw"]
+    raw_text = raw.content if isinstance(raw.content, str) else ""
+
+    parsed = None
+    if output["parsed"] is not None:
+        try:
+            parsed = schema.model_validate(output["parsed"])
+        except ValidationError:
+            parsed = None
+    return parsed, raw_text
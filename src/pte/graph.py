@@ -6,15 +6,19 @@
 
 from langgraph.graph import StateGraph, START, END
 
+from src.config import settings
 from src.pte.state import PTEState
 from src.pte.nodes import (
     planner_node,
+    speculative_planner_node,
+    speculation_join_node,
     executor_node,
     replanner_node,
     final_answer_node,
     error_handler_node,
 )
 from src.pte.nodes.intent_classifier import intent_classifier_node
+from src.pte.nodes.planner import should_adopt_speculative_plan
 
 
 def after_intent_classifier(state: PTEState) -> str:
@@ -28,6 +32,37 @@ def after_intent_classifier(state: PTEState) -> str:
     return "final_answer"
 
 
+def after_speculation_join(state: PTEState) -> str:
+    """Speculation join 후 분기 결정 (SPECULATIVE_PLANNER 활성화 시).
+
+    - needs_tool=False → final_answer (추측 계획 폐기)
+    - 추측 계획 채택 → after_planner와 동일하게 분기 (planner 생략)
+    - 그 외 → planner (intent를 반영해 다시 계획)
+    """
+    if not state.get("needs_tool", True):
+        return "final_answer"
+    if should_adopt_speculative_plan(state):
+        return after_planner(state)
+    return "planner"
+
+
+# 라우팅 테이블: (error 있음, plan 있음) → 다음 노드
+_PLANNER_ROUTES = {
+    (True, True): "error_handler",
+    (True, False): "error_handler",
+    (False, True): "executor",
+    (False, False): "final_answer",
+}
+
+# 라우팅 테이블: (마지막 step 실패, plan 남음) → 다음 노드
+_EXECUTOR_ROUTES = {
+    (True, True): "replanner",
+    (True, False): "replanner",
+    (False, True): "executor",
+    (False, False): "final_answer",
+}
+
+
 def after_planner(state: PTEState) -> str:
     """Planner 후 분기 결정.
 
@@ -35,11 +70,7 @@ def after_planner(state: PTEState) -> str:
     - plan 있음 → executor
     - plan 없음 → final_answer
     """
-    if state.get("error"):
-        return "error_handler"
-    if state.get("plan"):
-        return "executor"
-    return "final_answer"
+    return _PLANNER_ROUTES[(bool(state.get("error")), bool(state.get("plan")))]
 
 
 def after_executor(state: PTEState) -> str:
@@ -49,18 +80,12 @@ def after_executor(state: PTEState) -> str:
     - plan에 더 있음 → executor
     - plan 완료 → final_answer
     """
-    if not state.get("past_steps"):
+    past_steps = state.get("past_steps")
+    if not past_steps:
         return "final_answer"
 
-    last_step = state["past_steps"][-1]
-
-    if last_step.get("status") == "failure":
-        return "replanner"
-
-    if state.get("plan"):
-        return "executor"
-
-    return "final_answer"
+    failed = past_steps[-1].get("status") == "failure"
+    return _EXECUTOR_ROUTES[(failed, bool(state.get("plan")))]
 
 
 def after_replanner(state: PTEState) -> str:
@@ -83,6 +108,9 @@ def build_pte_graph() -> StateGraph:
                     ↘ final_answer (chitchat)              ↘ error_handler → END
     ```
 
+    settings.speculative_planner가 켜져 있으면 START에서 intent_classifier와
+    speculative_planner를 동시에 실행하고 speculation_join에서 합류한다.
+
     Returns:
         컴파일된 StateGraph
     """
@@ -100,15 +128,33 @@ def build_pte_graph() -> StateGraph:
     # 엣지 추가
     workflow.add_edge(START, "intent_classifier")
 
-    # Intent Classifier 후 분기
-    workflow.add_conditional_edges(
-        "intent_classifier",
-        after_intent_classifier,
-        {
-            "planner": "planner",
-            "final_answer": "final_answer",
-        },
-    )
+    if settings.speculative_planner:
+        # intent 분류와 계획 생성을 병렬 실행 후 합류
+        workflow.add_node("speculative_planner", speculative_planner_node)
+        workflow.add_node("speculation_join", speculation_join_node)
+        workflow.add_edge(START, "speculative_planner")
+        workflow.add_edge(["intent_classifier", "speculative_planner"], "speculation_join")
+
+        workflow.add_conditional_edges(
+            "speculation_join",
+            after_speculation_join,
+            {
+                "planner": "planner",
+                "executor": "executor",
+                "final_answer": "final_answer",
+                "error_handler": "error_handler",
+            },
+        )
+    else:
+        # Intent Classifier 후 분기
+        workflow.add_conditional_edges(
+            "intent_classifier",
+            after_intent_classifier,
+            {
+                "planner": "planner",
+                "final_answer": "final_answer",
+            },
+        )
 
     # Planner 후 분기
     workflow.add_conditional_edges(
@@ -154,7 +200,12 @@ _graph = None
 
 
 def get_pte_graph() -> StateGraph:
-    """PTE 그래프 싱글톤 반환."""
+    """PTE 그래프 싱글톤 반환.
+
+    컴파일은 프로세스당 1회 (수십 ms 미만)이며, 컴파일된 그래프는 노드 래퍼가
+    로컬 클로저라 pickle로 저장할 수 없다. 콜드 스타트 비용은 대부분
+    langchain/langgraph 모듈 import이므로 디스크 캐시로 줄일 수 있는 부분이 없다.
+    """
     global _graph
     if _graph is None:
         _graph = build_pte_graph()
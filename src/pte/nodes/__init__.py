@@ -1,6 +1,6 @@
 """PTE Node implementations."""
 
-from .planner import planner_node
+from .planner import planner_node, speculative_planner_node, speculation_join_node
 from .executor import executor_node
 from .replanner import replanner_node
 from .final_answer import final_answer_node
@@ -8,6 +8,8 @@ from .error_handler import error_handler_node
 
 __all__ = [
     "planner_node",
+    "speculative_planner_node",
+    "speculation_join_node",
     "executor_node",
     "replanner_node",
     "final_answer_node",
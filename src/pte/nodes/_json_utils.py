@@ -0,0 +1,18 @@
+"""Planner/Re-planner 공용 JSON 응답 파싱."""
+
+import orjson
+
+
+def parse_json_response(text: str) -> dict:
+    """LLM 응답에서 JSON 추출.
+
+    마크다운 코드 블록으로 감싸진 경우도 처리.
+    """
+    # 마크다운 코드 블록 제거
+    text = text.strip()
+    if text.startswith("```"):
+        # ```json 또는 ``` 첫 줄과 닫는 ``` 제거 (한 줄짜리 블록이면 여는 ```만)
+        first_line, _, body = text.partition("\n")
+        text = (body or first_line.removeprefix("```json").removeprefix("```")).removesuffix("```")
+
+    return orjson.loads(text)
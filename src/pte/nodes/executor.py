@@ -8,60 +8,261 @@
 - 전략 수정 ❌
 """
 
+import threading
+from collections import OrderedDict
+from concurrent.futures import ALL_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from src.cache import get_cache, tool_result_cache_key
+from src.config import settings
 from src.pte.state import PTEState
+from src.pte.tool_groups import ToolRiskLevel, get_tool_risk
 from src.tools import run_tool
+from src.tools.query_enhancer import enhance_query_bundle
 
 # 검색 도구 목록 (context 자동 주입 대상)
-SEARCH_TOOLS = {"web_search", "rag_retrieve", "search_wikipedia"}
+SEARCH_TOOLS: frozenset[str] = frozenset({"web_search", "rag_retrieve", "search_wikipedia"})
 
+# 결과를 캐시하지 않는 도구 (호출 시점마다 결과가 달라지거나 부수효과가 있음)
+NEVER_CACHE_TOOLS: frozenset[str] = frozenset({"get_current_datetime", "python_repl"})
 
-def executor_node(state: PTEState) -> dict:
-    """plan의 첫 번째 step을 실행.
 
-    Args:
-        state: 현재 상태
+class ParallelToolExecutor:
+    """서로 의존하지 않는 step들을 스레드 풀에서 동시에 실행.
+
+    I/O 위주 도구(web_search, rag_retrieve, get_weather 등)의 대기 시간을
+    합(sum)이 아닌 최댓값(max)으로 줄인다.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pte-tool",
+        )
+
+    def run(self, calls: list[Callable[[], dict]]) -> list[dict]:
+        """호출 목록을 동시에 실행하고 입력 순서대로 결과 반환."""
+        futures = [self._pool.submit(call) for call in calls]
+        wait(futures, return_when=ALL_COMPLETED)
+        return [future.result() for future in futures]
+
+    def submit(self, call: Callable[[], dict]) -> Future:
+        """호출 하나를 백그라운드로 실행."""
+        return self._pool.submit(call)
+
+
+# 싱글톤 실행기 인스턴스
+_tool_executor: ParallelToolExecutor | None = None
+
+
+def get_tool_executor() -> ParallelToolExecutor:
+    """ParallelToolExecutor 싱글톤 반환."""
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = ParallelToolExecutor(settings.tool_concurrency_limit)
+    return _tool_executor
+
+
+# Planner 스트리밍 중 미리 실행한 step (prefetch key → Future)
+_PREFETCH_MAX_ENTRIES = 32
+_prefetched: OrderedDict[str, Future] = OrderedDict()
+_prefetch_lock = threading.Lock()
+
+
+def _prefetch_key(
+    step: dict[str, Any],
+    user_input: str,
+    messages: list[dict[str, str]],
+    intent: str,
+    time_sensitive: str,
+) -> str:
+    return tool_result_cache_key(
+        step.get("tool"), step.get("input"), user_input, messages, intent, time_sensitive
+    )
+
+
+def prefetch_step(
+    step: dict[str, Any],
+    user_input: str,
+    messages: list[dict[str, str]],
+    intent: str,
+    time_sensitive: str,
+) -> bool:
+    """계획이 확정되기 전에 step을 미리 실행 (planner 스트리밍용).
+
+    다른 step을 참조하지 않는 저위험(읽기 전용) 도구만 대상으로 한다.
+    계획이 검증에 실패하면 결과는 사용되지 않고 오래된 순으로 버려진다.
 
     Returns:
-        past_steps에 실행 결과가 추가된 상태 업데이트
+        prefetch를 시작했는지 여부
     """
-    plan = list(state["plan"])  # 복사본 생성
-    past_steps = list(state["past_steps"])
-    user_input = state["input"]  # 원래 사용자 요청
-    messages = state.get("messages", [])  # 대화 히스토리
-    intent = state.get("intent", "new_question")  # 질문 의도
-    time_sensitive = state.get("time_sensitive", "none")  # 시간 민감도
+    if step.get("input_from") or get_tool_risk(step.get("tool")) != ToolRiskLevel.LOW:
+        return False
+
+    key = _prefetch_key(step, user_input, messages, intent, time_sensitive)
+    with _prefetch_lock:
+        if key not in _prefetched:
+            _prefetched[key] = get_tool_executor().submit(
+                lambda: _execute_step(step, {}, user_input, messages, intent, time_sensitive)
+            )
+            while len(_prefetched) > _PREFETCH_MAX_ENTRIES:
+                _prefetched.popitem(last=False)
+    return True
+
+
+def _take_prefetched(
+    step: dict[str, Any],
+    user_input: str,
+    messages: list[dict[str, str]],
+    intent: str,
+    time_sensitive: str,
+) -> Future | None:
+    """미리 실행 중/완료된 step의 Future 꺼내기 (없으면 None)."""
+    if not _prefetched:
+        return None
+    key = _prefetch_key(step, user_input, messages, intent, time_sensitive)
+    with _prefetch_lock:
+        return _prefetched.pop(key, None)
+
+
+def _parse_step_ref(input_from: str | None) -> int | None:
+    """"step_N" 형식에서 N 추출. 형식이 다르면 None."""
+    if not input_from:
+        return None
+    try:
+        return int(input_from.replace("step_", ""))
+    except ValueError:
+        return None
+
+
+def _take_runnable_steps(
+    plan: list[dict[str, Any]],
+    past_steps_by_id: dict[Any, dict[str, Any]],
+    limit: int,
+) -> list[dict[str, Any]]:
+    """plan 앞쪽에서 바로 실행 가능한 연속 step들을 선택.
 
+    - 첫 번째 step은 항상 포함 (기존 FIFO 동작)
+    - 이후 step은 input_from이 없거나 이미 실행된 step을 참조할 때만 포함
+    - 고위험 도구(python_repl 등)는 다른 step과 함께 실행하지 않음
+    - limit <= 1이면 기존처럼 한 번에 한 step만 실행
+    """
     if not plan:
-        return {"plan": [], "past_steps": past_steps}
+        return []
+    if limit <= 1 or get_tool_risk(plan[0].get("tool")) == ToolRiskLevel.HIGH:
+        return plan[:1]
+
+    runnable = [plan[0]]
+
+    for step in plan[1:]:
+        if get_tool_risk(step.get("tool")) == ToolRiskLevel.HIGH:
+            break
+        if step.get("input_from") and _parse_step_ref(step["input_from"]) not in past_steps_by_id:
+            break
+        runnable.append(step)
+
+    return runnable
+
+
+def _is_tool_cacheable(tool_name: str | None, time_sensitive: str) -> bool:
+    """도구 결과 캐시 사용 여부."""
+    if not settings.cache_enabled or tool_name in NEVER_CACHE_TOOLS:
+        return False
+    # 최신 정보 검색은 캐시 스킵
+    if tool_name == "web_search" and time_sensitive != "none":
+        return False
+    return True
 
-    # 첫 번째 step 가져오기 (FIFO)
-    step = plan.pop(0)
 
-    # 입력 결정
-    tool_input = step.get("input")
+def _make_enhancement_bundle(
+    steps: list[dict[str, Any]],
+    user_input: str,
+    messages: list[dict[str, str]],
+    intent: str,
+    time_sensitive: str,
+) -> tuple[Callable[[], None], list[dict[str, Any]]] | None:
+    """같은 batch의 web_search + search_wikipedia 쿼리 증강을 LLM 한 번으로 묶기.
+
+    Returns:
+        (증강 콜백, 대상 step 목록) 또는 None.
+        대상 step은 실행 전에 콜백을 호출한다. 먼저 호출한 쪽이 묶음 증강을 수행하고,
+        다른 쪽은 끝날 때까지 기다린 뒤 증강 캐시에서 결과를 가져간다.
+    """
+    web = next((s for s in steps if s.get("tool") == "web_search" and not s.get("input_from")), None)
+    wiki = next(
+        (s for s in steps if s.get("tool") == "search_wikipedia" and not s.get("input_from")), None
+    )
+    if web is None or wiki is None:
+        return None
+    if not (isinstance(web.get("input"), str) and isinstance(wiki.get("input"), str)):
+        return None
+
+    lock = threading.Lock()
+    done = False
+
+    def enhance_once() -> None:
+        nonlocal done
+        with lock:
+            if done:
+                return
+            done = True
+            # 실패해도 각 도구가 개별로 증강하므로 결과는 무시
+            enhance_query_bundle(
+                web["input"], wiki["input"], user_input, messages, intent, time_sensitive
+            )
+
+    return enhance_once, [web, wiki]
+
+
+def _execute_step(
+    step: dict[str, Any],
+    past_steps_by_id: dict[Any, dict[str, Any]],
+    user_input: str,
+    messages: list[dict[str, str]],
+    intent: str,
+    time_sensitive: str,
+) -> dict[str, Any]:
+    """단일 step 실행 후 past_steps 항목 반환."""
+    tool_name, tool_input, input_from = (
+        step.get("tool"),
+        step.get("input"),
+        step.get("input_from"),
+    )
     from_previous_step = False
 
+    # planner 스트리밍 중 미리 실행된 step이면 그 결과 사용
+    # (아직 시작 전이면 취소하고 여기서 실행 - 같은 풀 안에서 대기하지 않도록)
+    if not input_from:
+        future = _take_prefetched(step, user_input, messages, intent, time_sensitive)
+        if future is not None and not future.cancel():
+            return {**future.result(), "step": step}
+
     # input_from이 있으면 이전 step의 output 사용
-    input_from = step.get("input_from")
-
-    if input_from and past_steps:
-        # "step_N" 형식에서 N 추출
-        try:
-            ref_step_id = int(input_from.replace("step_", ""))
-            for past in past_steps:
-                if past["step"].get("step_id") == ref_step_id:
-                    tool_input = past["output"]
-                    from_previous_step = True
-                    break
-        except (ValueError, KeyError):
-            pass
+    ref_step_id = _parse_step_ref(input_from)
+    if ref_step_id is not None and ref_step_id in past_steps_by_id:
+        tool_input = past_steps_by_id[ref_step_id]["output"]
+        from_previous_step = True
 
     # 도구 실행
-    tool_name = step.get("tool")
+    is_search = tool_name in SEARCH_TOOLS
+
+    # 동일 (도구, 입력) 재호출은 캐시된 결과 재사용 (replan 시 특히 빈번)
+    cache_key = None
+    if _is_tool_cacheable(tool_name, time_sensitive):
+        if is_search:
+            cache_key = tool_result_cache_key(
+                tool_name, tool_input, user_input, messages, intent, time_sensitive
+            )
+        else:
+            cache_key = tool_result_cache_key(tool_name, tool_input)
+        cached = get_cache("tool_result").get(cache_key)
+        if cached is not None:
+            return {"step": step, "status": "success", "output": cached}
 
     try:
         # 검색 도구인 경우 context, from_previous_step, history, intent, time_sensitive 자동 주입
-        if tool_name in SEARCH_TOOLS:
+        if is_search:
             output = run_tool(
                 tool_name,
                 tool_input,
@@ -78,14 +279,71 @@ def executor_node(state: PTEState) -> dict:
         output = str(e)
         status = "failure"
 
-    # 결과 기록
-    past_steps.append({
+    if cache_key is not None and status == "success":
+        get_cache("tool_result").set(cache_key, output)
+
+    return {
         "step": step,
         "status": status,
         "output": output,
-    })
+    }
+
+
+def executor_node(state: PTEState) -> dict:
+    """plan 앞쪽의 실행 가능한 step들을 실행.
+
+    서로 의존하지 않는 step은 동시에 실행하고, 결과는 plan 순서대로 기록한다.
+    실패한 step은 마지막에 기록하여 after_executor가 replanner로 분기하도록 한다.
+
+    Args:
+        state: 현재 상태
+
+    Returns:
+        past_steps에 실행 결과가 추가된 상태 업데이트
+    """
+    plan = state["plan"]  # 읽기 전용 (상태 업데이트는 새 리스트로 반환)
+    past_steps = state["past_steps"]
+    user_input = state["input"]  # 원래 사용자 요청
+    messages = state["messages"]  # 대화 히스토리
+    intent = state.get("intent", "new_question")  # 질문 의도
+    time_sensitive = state.get("time_sensitive", "none")  # 시간 민감도
+
+    if not plan:
+        return {"plan": [], "past_steps": past_steps}
+
+    # step_id → 실행 결과 (input_from 조회용, 같은 id가 여러 번이면 먼저 실행된 것 우선)
+    past_steps_by_id = state.get("past_steps_by_id")
+    if past_steps_by_id is None:
+        past_steps_by_id = {}
+        for past in past_steps:
+            past_steps_by_id.setdefault(past["step"].get("step_id"), past)
+
+    steps = _take_runnable_steps(plan, past_steps_by_id, settings.tool_concurrency_limit)
+
+    if len(steps) == 1:
+        results = [
+            _execute_step(steps[0], past_steps_by_id, user_input, messages, intent, time_sensitive)
+        ]
+    else:
+        bundle = _make_enhancement_bundle(steps, user_input, messages, intent, time_sensitive)
+
+        def run_step(step: dict[str, Any]) -> dict:
+            if bundle is not None and any(step is s for s in bundle[1]):
+                bundle[0]()
+            return _execute_step(step, past_steps_by_id, user_input, messages, intent, time_sensitive)
+
+        results = get_tool_executor().run([lambda step=step: run_step(step) for step in steps])
+
+    # 결과 기록 (성공 → 실패 순, 각각 plan 순서 유지)
+    results.sort(key=lambda r: r["status"] != "success")  # stable sort
+
+    # 인덱스 갱신 (상태 값은 직접 수정하지 않고 새 dict로 반환)
+    updated_by_id = dict(past_steps_by_id)
+    for r in results:
+        updated_by_id.setdefault(r["step"].get("step_id"), r)
 
     return {
-        "plan": plan,
-        "past_steps": past_steps,
+        "plan": plan[len(steps):],
+        "past_steps": past_steps + results,
+        "past_steps_by_id": updated_by_id,
     }
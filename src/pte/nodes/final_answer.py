@@ -7,27 +7,16 @@
 - 새로운 plan 생성 ❌
 """
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 
-from src.llm import get_llm
+from src.llm import get_llm, cached_system_message
 from src.config import settings
 from src.pte.state import PTEState
 
 
+# 정적 프롬프트 (규칙, 프롬프트 캐시 대상)
 FINAL_ANSWER_PROMPT = """You are a Final Answer node that delivers execution results to the user.
-
-## Current Time
-{current_datetime}
-
-## Conversation History
-{conversation_history}
-
-## Current Request
-- 사용자 원본: {original_input}
-- 시스템 해석: {rewritten_query}
-
-## Execution Results
-{execution_results}
+The current request and execution results are given at the end.
 
 ## Rules
 1. Answer based on execution results, naturally incorporating the system's interpretation
@@ -44,16 +33,23 @@ FINAL_ANSWER_PROMPT = """You are a Final Answer node that delivers execution res
 7. Respond in the same language as the user's input"""
 
 
-GENERAL_CONVERSATION_PROMPT = """You are a friendly AI assistant.
-
-## Current Time
+# 동적 컨텍스트 (매 턴 변경, 캐시 제외)
+FINAL_ANSWER_CONTEXT_TEMPLATE = """## Current Time
 {current_datetime}
 
 ## Conversation History
 {conversation_history}
 
-## User's Request
-{original_input}
+## Current Request
+- 사용자 원본: {original_input}
+- 시스템 해석: {rewritten_query}
+
+## Execution Results
+{execution_results}"""
+
+
+GENERAL_CONVERSATION_PROMPT = """You are a friendly AI assistant.
+The user's request is given at the end.
 
 ## How to respond:
 1. If user gave an instruction (번역, 요약, 분석, 설명 등) with content → perform that action
@@ -66,18 +62,29 @@ GENERAL_CONVERSATION_PROMPT = """You are a friendly AI assistant.
 Respond in the same language as the user's input."""
 
 
+GENERAL_CONVERSATION_CONTEXT_TEMPLATE = """## Current Time
+{current_datetime}
+
+## Conversation History
+{conversation_history}
+
+## User's Request
+{original_input}"""
+
+
+_ROLE_LABELS = {"user": "사용자", "assistant": "어시스턴트"}
+
+
 def format_conversation_history(messages: list[dict[str, str]], max_messages: int = 10) -> str:
     """대화 히스토리를 텍스트로 포맷팅."""
     if not messages:
         return "(없음)"
 
-    recent_messages = messages[-max_messages:]
-    history_lines = []
-    for msg in recent_messages:
-        role = "사용자" if msg["role"] == "user" else "어시스턴트"
-        content = msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
-        history_lines.append(f"- {role}: {content}")
-    return "\n".join(history_lines)
+    return "\n".join(
+        f"- {_ROLE_LABELS.get(msg['role'], '어시스턴트')}: "
+        f"{(c := msg['content'])[:100]}{'...' if len(c) > 100 else ''}"
+        for msg in messages[-max_messages:]
+    )
 
 
 def final_answer_node(state: PTEState) -> dict:
@@ -91,7 +98,7 @@ def final_answer_node(state: PTEState) -> dict:
     """
     current_datetime = state["current_datetime"]
     messages = state["messages"]
-    history_text = format_conversation_history(messages)
+    history_text = state.get("conversation_history") or format_conversation_history(messages)
 
     # 원본 입력과 재작성된 쿼리 모두 사용
     original_input = state["input"]
@@ -104,14 +111,16 @@ def final_answer_node(state: PTEState) -> dict:
             temperature=0.7,
         )
 
-        system_prompt = GENERAL_CONVERSATION_PROMPT.format(
+        context = GENERAL_CONVERSATION_CONTEXT_TEMPLATE.format(
             current_datetime=current_datetime,
             conversation_history=history_text,
             original_input=original_input,
         )
 
         response = llm.invoke([
-            SystemMessage(content=system_prompt),
+            cached_system_message(
+                GENERAL_CONVERSATION_PROMPT, context, model=settings.final_model
+            ),
             HumanMessage(content="Respond to the user's request above."),
         ])
 
@@ -141,7 +150,7 @@ def final_answer_node(state: PTEState) -> dict:
         temperature=0.7,
     )
 
-    system_prompt = FINAL_ANSWER_PROMPT.format(
+    context = FINAL_ANSWER_CONTEXT_TEMPLATE.format(
         current_datetime=current_datetime,
         conversation_history=history_text,
         original_input=original_input,
@@ -150,7 +159,7 @@ def final_answer_node(state: PTEState) -> dict:
     )
 
     response = llm.invoke([
-        SystemMessage(content=system_prompt),
+        cached_system_message(FINAL_ANSWER_PROMPT, context, model=settings.final_model),
         HumanMessage(content="위 결과를 바탕으로 답변해주세요."),
     ])
 
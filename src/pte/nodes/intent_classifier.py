@@ -9,161 +9,72 @@
 - chitchat: 잡담 (고마워, 안녕, 잘가)
 """
 
-import json
 import re
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
 
-from src.llm import get_llm
+from src.cache import get_cache, get_semantic_cache, llm_response_cache_key
+from src.llm import get_llm, cached_system_message, get_embedding, invoke_structured
 from src.config import settings
+from src.pte.prompts import load_prompt
 from src.pte.state import PTEState
+from src.pte.schemas import IntentClassification
+
+
+# 결정적 출력 (응답 캐시는 temperature=0일 때만 사용)
+INTENT_TEMPERATURE = 0.0
+
+# 응답 파싱용 ("Key: value" 라인 → 결과 필드)
+_RESPONSE_KEYS = {
+    "intent": "intent",
+    "constraints": "constraints",
+    "time sensitive": "time_sensitive",
+    "rewritten query": "rewritten_query",
+    "needs tool": "needs_tool",
+}
+_RESPONSE_PREFIXES = tuple(f"{key}:" for key in _RESPONSE_KEYS)
+_VALID_INTENTS = frozenset({"new_question", "follow_up", "clarification", "chitchat"})
+_VALID_TIME_SENSITIVE = frozenset({"none", "current", "specified"})
+
+# LLM 없이 분류 가능한 짧은 입력 (fast path)
+_FAST_PATH_MAX_LEN = 12
+_CHITCHAT_EXACT = frozenset({
+    "고마워", "고맙습니다", "감사", "감사합니다", "안녕", "안녕하세요", "잘가", "잘자", "ㅎㅇ",
+    "ㅋㅋ", "ㅋㅋㅋ", "ㅎㅎ", "오키", "ok", "okay", "thanks", "thank you",
+})
+_CHITCHAT_RE = re.compile(
+    r"^(고마워요?|감사해요|잘\s*가|잘\s*자|안녕히?|ㅋ+|ㅎ+|하이|hi|hello|bye)[!?.~♥ㅋㅎ\s]*$",
+    re.IGNORECASE,
+)
+# 짧은 맞장구: 이전 대화가 있으면 질문에 대한 승낙("응" → 더 찾아줘)일 수 있어 첫 턴에만 적용
+_ACK_EXACT = frozenset({"네", "넵", "응", "웅", "알겠어", "알겠습니다", "좋아", "좋아요"})
+_TIME_QUERY_RE = re.compile(
+    r"^(지금|현재|오늘)?\s*(몇\s*시|시간|시각|날짜|며칠|무슨\s*요일)"
+    r"\s*(이야|야|에요|예요|이에요|인가요|임|이지|냐|니|일까)?[?!.~\s]*$"
+)
+
+
+# 동적 입력 (매 턴 변경, human 메시지로 전달)
+def _build_input_section(
+    user_input: str,
+    previous_context: str,
+    history: str,
+    current_datetime: str,
+) -> str:
+    """턴마다 바뀌는 "## Input" 섹션 생성.
+
+    정적 프롬프트는 그대로 두고 작은 동적 부분만 f-string으로 조립한다.
+    """
+    return (
+        "## Input\n"
+        f"- User message: {user_input}\n"
+        f"- Previous context: {previous_context}\n"
+        f"- Conversation history: {history}\n"
+        f"- Current time: {current_datetime}"
+    )
 
 
-INTENT_CLASSIFIER_PROMPT = """You are an intent classifier for a Korean AI assistant.
-
-## Input
-- User message: {user_input}
-- Previous context: {previous_context}
-- Conversation history: {history}
-- Current time: {current_datetime}
-
-## Intent Types
-- new_question: 새로운 주제에 대한 질문
-- follow_up: 이전 대화의 후속 질문 ("더 있어?", "또?", "다른 건?", "자세히")
-- clarification: 이전 답변에 대한 명확화 요청 ("무슨 말이야?", "예시 들어줘")
-- chitchat: 인사, 감사, 잡담 ("고마워", "안녕", "ㅋㅋ", "오키")
-
-## Think step by step, then output:
-
-### Step 1: Intent Classification
-What type of message is this? (new_question / follow_up / clarification / chitchat)
-
-### Step 2: Constraints Extraction (for follow_up)
-If follow_up, list ALL constraints that must be preserved.
-**IMPORTANT**: Use "Previous context" first (if available), then conversation history.
-- Time/Year (연도, 기간) - e.g., "2022년", "2020~2024년"
-- Location (지역, 위치)
-- Preferences (알레르기, 채식, 예산, 분위기)
-- Subject (what they were asking about)
-- Any other requirements
-
-⚠️ Time constraints are especially important! If "Previous context" has a year, PRESERVE it.
-
-### Step 3: Time Sensitive
-Is this query time-sensitive?
-- current: 현재/최신 기준 (요즘, 최신, 트렌드, 인기, 핫한, 올해)
-- specified: 사용자가 연도/기간 지정 (2020년, 작년, 90년대)
-- none: 시간 무관 (정의, 개념, 역사적 사실, 원리)
-
-⚠️ IMPORTANT: Time expression handling:
-- current: PRESERVE existing time expressions ("요즘", "최신", "트렌드")
-- specified: PRESERVE user's year/period, do NOT add new time expressions like "최신"
-  - "2024년 쿠버네티스 정보" → "2024년 쿠버네티스 정보" (O)
-  - "2024년 쿠버네티스 정보" → "2024년 쿠버네티스 최신 정보" (X) ← 불필요한 "최신" 추가
-- none: No time expressions needed
-
-### Step 4: Rewritten Query
-Rewrite the query to be explicit, preserving all constraints from Step 2.
-Do NOT add time expressions that user didn't use.
-
-### Step 5: Tool Needed?
-Does this require external tools (search, calculator, etc.)?
-- new_question: 대부분 true (검색, 계산 등 필요)
-- follow_up: 새로운 정보 요청이면 true, 이전 답변 재설명만이면 false
-- clarification: 이전 답변 재설명이면 false, 추가 정보 필요하면 true
-- chitchat: 항상 false
-
-## Output format:
----
-Intent: [new_question|follow_up|clarification|chitchat]
-Constraints: [list of preserved constraints, or "none" for new questions]
-Time sensitive: [none|current|specified]
-Rewritten query: [explicit query with all constraints, preserve time expressions]
-Needs tool: [true|false]
----
-
-## Examples
-
-User: "더 있어?"
-History: "[User]: 영등포 견과류 알레르기 안전한 맛집 추천해줘 [Assistant]: A식당, B식당을 추천드립니다..."
----
-Intent: follow_up
-Constraints: 위치(영등포), 제약사항(견과류 알레르기 안전), 주제(맛집)
-Time sensitive: none
-Rewritten query: 영등포 견과류 알레르기 안전한 다른 맛집 추천
-Needs tool: true
----
-
-User: "고마워!"
-History: (any)
----
-Intent: chitchat
-Constraints: none
-Time sensitive: none
-Rewritten query:
-Needs tool: false
----
-
-User: "요즘 핫한 카페 알려줘"
-History: (없음), Current time: 2025년 1월
----
-Intent: new_question
-Constraints: none
-Time sensitive: current
-Rewritten query: 요즘 핫한 카페 추천
-Needs tool: true
----
-
-User: "2024년 쿠버네티스 정보 알려줘"
-History: (없음)
----
-Intent: new_question
-Constraints: none
-Time sensitive: specified
-Rewritten query: 2024년 쿠버네티스 정보
-Needs tool: true
----
-
-User: "무슨 말이야? 다시 설명해줘"
-History: "[User]: 쿠버네티스 뭐야? [Assistant]: 쿠버네티스는 컨테이너 오케스트레이션 플랫폼입니다..."
----
-Intent: clarification
-Constraints: 주제(쿠버네티스)
-Time sensitive: none
-Rewritten query: 쿠버네티스 설명 재요청
-Needs tool: false
----
-
-User: "그럼 2022년에는 어떤 기능이 추가됐어?"
-History: "[User]: 쿠버네티스 뭐야? [Assistant]: 쿠버네티스는 컨테이너 오케스트레이션 플랫폼입니다..."
----
-Intent: follow_up
-Constraints: 주제(쿠버네티스)
-Time sensitive: specified
-Rewritten query: 2022년 쿠버네티스 추가된 기능
-Needs tool: true
----
-
-User: "보안 측면에서 더 알려줘"
-Previous context: "2022년 쿠버네티스 정보"
-History: "[User]: 2022년 쿠버네티스 정보 알려줘 [Assistant]: 2022년 쿠버네티스는..."
----
-Intent: follow_up
-Constraints: 연도(2022년), 주제(쿠버네티스)
-Time sensitive: specified
-Rewritten query: 2022년 쿠버네티스 보안
-Needs tool: true
----
-
-User: "오늘 서울시는 미세먼지 저감 대책의 일환으로 차량 2부제를 시행한다고 발표했다. 이에 따라 홀수 날짜에는 홀수 번호판 차량만... (긴 본문)"
-History: (없음)
----
-Intent: new_question
-Constraints: none
-Time sensitive: none
-Rewritten query: (사용자가 제공한 콘텐츠 분석/처리)
-Needs tool: false
----"""
+_HISTORY_ROLE_LABELS = {"user": "User", "assistant": "Assistant"}
 
 
 def _format_history(messages: list[dict[str, str]], max_chars: int = 3000) -> str:
@@ -184,7 +95,7 @@ def _format_history(messages: list[dict[str, str]], max_chars: int = 3000) -> st
 
     # 최신 메시지부터 역순으로 추가 (최근 게 더 중요)
     for msg in reversed(messages):
-        role = "User" if msg.get("role") == "user" else "Assistant"
+        role = _HISTORY_ROLE_LABELS.get(msg.get("role"), "Assistant")
         content = msg.get("content", "")
         line = f"[{role}]: {content}"
 
@@ -192,13 +103,13 @@ def _format_history(messages: list[dict[str, str]], max_chars: int = 3000) -> st
             # 남은 공간에 맞게 자르기
             remaining = max_chars - total_chars
             if remaining > 100:
-                truncated = content[: remaining - 50] + "..."
-                lines.insert(0, f"[{role}]: {truncated}")
+                lines.append(f"[{role}]: {content[: remaining - 50]}...")
             break
 
-        lines.insert(0, line)  # 순서 유지를 위해 앞에 삽입
+        lines.append(line)
         total_chars += len(line) + 2  # \n\n 고려
 
+    lines.reverse()  # 시간순 복원
     return "\n\n".join(lines) if lines else "(없음)"
 
 
@@ -222,63 +133,95 @@ def _parse_intent_response(response_text: str, fallback_query: str) -> dict:
         "constraints": "",
     }
 
-    # Intent 추출
-    intent_match = re.search(
-        r'Intent:\s*(new_question|follow_up|clarification|chitchat)',
-        text,
-        re.IGNORECASE
-    )
-    if intent_match:
-        result["intent"] = intent_match.group(1).lower()
-
-    # Constraints 추출 (디버깅/로깅용)
-    constraints_match = re.search(
-        r'Constraints:\s*(.+?)(?:\n|---|$)',
-        text,
-        re.IGNORECASE
-    )
-    if constraints_match:
-        result["constraints"] = constraints_match.group(1).strip()
-
-    # Time sensitive 추출
-    time_match = re.search(
-        r'Time sensitive:\s*(none|current|specified)',
-        text,
-        re.IGNORECASE
-    )
-    if time_match:
-        result["time_sensitive"] = time_match.group(1).lower()
-
-    # Rewritten query 추출
-    query_match = re.search(
-        r'Rewritten query:\s*(.+?)(?:\n|---|$)',
-        text,
-        re.IGNORECASE
-    )
-    if query_match:
-        query = query_match.group(1).strip()
-        # 대괄호, 따옴표 제거
-        query = re.sub(r'^[\["\']|[\]"\']$', '', query)
-        if query and query.lower() != "none":
-            result["rewritten_query"] = query
-
-    # Needs tool 추출
-    needs_tool_match = re.search(
-        r'Needs tool:\s*(true|false)',
-        text,
-        re.IGNORECASE
-    )
-    if needs_tool_match:
-        result["needs_tool"] = needs_tool_match.group(1).lower() == "true"
-
-    # chitchat이면 needs_tool = False 강제
+    # "Key: value" 라인을 한 번만 훑어서 필드별 첫 값 수집
+    fields: dict[str, str] = {}
+    for line in text.splitlines():
+        line = line.lstrip(" -*#")
+        # 대부분의 라인(헤더, 설명 문장)은 prefix 비교 한 번으로 건너뜀
+        if not line.lower().startswith(_RESPONSE_PREFIXES):
+            continue
+        key, _, value = line.partition(":")
+        field = _RESPONSE_KEYS.get(key.strip(" *").lower())
+        if field and field not in fields:
+            fields[field] = value.split("---", 1)[0].strip(" *")
+
+    # Intent / Time sensitive: 첫 단어만 사용 (허용값이 아니면 기본값 유지)
+    intent = fields.get("intent", "").partition(" ")[0].lower()
+    if intent in _VALID_INTENTS:
+        result["intent"] = intent
+
+    time_sensitive = fields.get("time_sensitive", "").partition(" ")[0].lower()
+    if time_sensitive in _VALID_TIME_SENSITIVE:
+        result["time_sensitive"] = time_sensitive
+
+    # Constraints (디버깅/로깅용)
+    if fields.get("constraints"):
+        result["constraints"] = fields["constraints"]
+
+    # Rewritten query (대괄호, 따옴표 제거)
+    query = fields.get("rewritten_query", "").strip("[]\"'")
+    if query and query.lower() != "none":
+        result["rewritten_query"] = query
+
+    # Needs tool
+    needs_tool = fields.get("needs_tool", "").lower()
+    if needs_tool.startswith(("true", "false")):
+        result["needs_tool"] = needs_tool.startswith("true")
+
+    return _apply_intent_rules(result)
+
+
+def _apply_intent_rules(result: dict) -> dict:
+    """파싱된 분류 결과에 공통 규칙 적용 (chitchat이면 needs_tool = False 강제)."""
     if result["intent"] == "chitchat":
         result["needs_tool"] = False
         result["rewritten_query"] = ""
-
     return result
 
 
+def _match_fast_path(user_input: str, has_history: bool = False) -> dict | None:
+    """LLM 호출 없이 확정 가능한 입력이면 분류 결과 반환.
+
+    - 인사/감사 등 짧은 일상 대화 → chitchat
+    - 짧은 맞장구 (대화 첫 턴만) → chitchat
+    - 현재 시간/날짜 질문 → 주입된 Current Time으로 답변 가능 (도구 불필요)
+    """
+    stripped = user_input.strip()
+    lowered = stripped.lower().rstrip("!?.~ ")
+    is_chitchat = len(stripped) <= _FAST_PATH_MAX_LEN and (
+        lowered in _CHITCHAT_EXACT
+        or _CHITCHAT_RE.match(stripped) is not None
+        or (not has_history and lowered in _ACK_EXACT)
+    )
+    if is_chitchat:
+        return {
+            "intent": "chitchat",
+            "rewritten_query": stripped,
+            "needs_tool": False,
+            "time_sensitive": "none",
+        }
+    if _TIME_QUERY_RE.match(stripped):
+        return {
+            "intent": "new_question",
+            "rewritten_query": stripped,
+            "needs_tool": False,
+            "time_sensitive": "current",
+        }
+    return None
+
+
+def _is_cacheable(result: dict, current_datetime: str) -> bool:
+    """분류 결과를 응답 캐시에 저장해도 되는지 확인.
+
+    시간 민감 질문이나 현재 시각이 반영된 재작성 결과는 저장하지 않는다.
+    """
+    if result["time_sensitive"] != "none":
+        return False
+    if current_datetime and current_datetime in result["rewritten_query"]:
+        return False
+    return True
+
+
 def intent_classifier_node(state: PTEState) -> dict:
     """사용자 질문의 의도를 파악하고 필요시 재작성.
 
@@ -289,14 +232,19 @@ def intent_classifier_node(state: PTEState) -> dict:
         intent, rewritten_query, needs_tool이 설정된 상태 업데이트
     """
     user_input = state["input"]
-    messages = state.get("messages", [])
-    current_datetime = state.get("current_datetime", "")
+    messages = state["messages"]
+    current_datetime = state["current_datetime"]
     previous_rewritten_query = state.get("previous_rewritten_query")
 
+    # 규칙으로 확정 가능한 입력은 LLM 호출 생략
+    fast_result = _match_fast_path(user_input, has_history=bool(messages))
+    if fast_result is not None:
+        return fast_result
+
     # LLM 호출
     llm = get_llm(
         model=settings.default_model,
-        temperature=0.0,
+        temperature=INTENT_TEMPERATURE,
     )
 
     history_text = _format_history(messages)
@@ -304,32 +252,75 @@ def intent_classifier_node(state: PTEState) -> dict:
     # 이전 맥락 포맷팅
     previous_context = previous_rewritten_query if previous_rewritten_query else "(없음)"
 
-    prompt = INTENT_CLASSIFIER_PROMPT.format(
-        user_input=user_input,
-        previous_context=previous_context,
-        history=history_text,
-        current_datetime=current_datetime,
+    # 응답 캐시 조회 (현재 시각은 분 단위로 바뀌므로 키에서 제외)
+    cache = None
+    if settings.cache_enabled and INTENT_TEMPERATURE == 0.0:
+        cache = get_cache("intent")
+        cache_key = llm_response_cache_key(
+            settings.default_model,
+            f"{load_prompt('intent_classifier')}\n\n{user_input}\n{previous_context}\n{history_text}",
+            INTENT_TEMPERATURE,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+    # 시맨틱 캐시 조회: 대화 맥락이 없는 입력만, chitchat 결과만 재사용
+    semantic_cache = None
+    embedding = None
+    if (
+        settings.cache_enabled
+        and settings.cache_semantic_enabled
+        and not messages
+        and not previous_rewritten_query
+    ):
+        embedding = get_embedding(user_input)
+        if embedding is not None:
+            semantic_cache = get_semantic_cache("intent")
+            cached = semantic_cache.get(embedding)
+            if cached is not None:
+                return {**cached, "rewritten_query": user_input}
+
+    input_section = _build_input_section(
+        user_input, previous_context, history_text, current_datetime
     )
 
-    try:
-        response = llm.invoke([
-            SystemMessage(content=prompt),
-            HumanMessage(content=f"User message: {user_input}"),
-        ])
+    # 정적 규칙은 system, 턴마다 바뀌는 입력은 human 메시지로 분리 (prefix 캐시 유지)
+    messages_for_llm = [
+        cached_system_message(load_prompt("intent_classifier"), model=settings.default_model),
+        HumanMessage(content=input_section),
+    ]
 
-        result = _parse_intent_response(response.content, user_input)
+    try:
+        if settings.structured_output:
+            # JSON Schema 강제 출력 (파싱 실패 시 텍스트 파서로 폴백)
+            parsed, raw_text = invoke_structured(llm, IntentClassification, messages_for_llm)
+            if parsed is not None:
+                result = _apply_intent_rules(parsed.model_dump())
+            else:
+                result = _parse_intent_response(raw_text, user_input)
+        else:
+            response = llm.invoke(messages_for_llm)
+            result = _parse_intent_response(response.content, user_input)
 
         # 디버깅용 로그 (필요시 활성화)
         # if result.get("constraints"):
         #     print(f"[IntentClassifier] Constraints: {result['constraints']}")
 
-        return {
+        update = {
             "intent": result["intent"],
             "rewritten_query": result["rewritten_query"] or user_input,
             "needs_tool": result["needs_tool"],
             "time_sensitive": result["time_sensitive"],
         }
 
+        if cache is not None and _is_cacheable(update, current_datetime):
+            cache.set(cache_key, update)
+        if semantic_cache is not None and update["intent"] == "chitchat":
+            semantic_cache.set(embedding, update)
+
+        return update
+
     except Exception as e:
         # 에러 시 기본값 (새 질문으로 처리)
         return {
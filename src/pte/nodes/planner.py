@@ -8,35 +8,36 @@
 - JSON Schema validation 실패 시 실행 금지
 """
 
-import json
-import re
+import functools
+from typing import Callable
 
-from langchain_core.messages import HumanMessage, SystemMessage
+import orjson
 
-from src.llm import get_llm
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from src.llm import get_llm, cached_system_message, invoke_structured
 from src.config import settings
+from src.pte.prompts import load_prompt
 from src.pte.state import PTEState
-from src.pte.schemas import Plan
+from src.pte.nodes._json_utils import parse_json_response
+from src.pte.schemas import PLAN_ADAPTER, PLAN_STEP_ADAPTER, Plan, PlanStep
+from src.pte.nodes.final_answer import format_conversation_history
+from src.pte.nodes.intent_classifier import _match_fast_path
+from src.pte.nodes.executor import prefetch_step
 
 
-def parse_json_response(text: str) -> dict:
-    """LLM 응답에서 JSON 추출.
+@functools.lru_cache(maxsize=4)
+def _build_system_prompt(tool_manifest: str) -> str:
+    """정적 system 프롬프트 (prompts/planner.txt + tool_manifest, 프롬프트 캐시 대상).
 
-    마크다운 코드 블록으로 감싸진 경우도 처리.
+    tool_manifest는 배포 단위로 고정이므로 결과를 재사용한다.
     """
-    # 마크다운 코드 블록 제거
-    text = text.strip()
-    if text.startswith("```"):
-        # ```json 또는 ``` 제거
-        text = re.sub(r"^```(?:json)?\s*\n?", "", text)
-        text = re.sub(r"\n?```$", "", text)
-
-    return json.loads(text)
-
+    return load_prompt("planner").replace("{tool_manifest}", tool_manifest)
 
-PLANNER_PROMPT = """You are a Planner that analyzes user requests and creates execution plans.
 
-## Current Time
+# 동적 입력 (매 턴 변경, human 메시지로 전달)
+PLANNER_INPUT_TEMPLATE = """## Current Time
 {current_datetime}
 
 ## User Intent
@@ -45,62 +46,72 @@ PLANNER_PROMPT = """You are a Planner that analyzes user requests and creates ex
 ## Conversation History
 {conversation_history}
 
-## Rules
-1. Only use available tools listed below
-2. Each step calls exactly one tool
-3. Assign step_id starting from 1
-4. Return empty steps if no tool is needed
-5. Simple time/date questions can be answered from "Current Time" above (no tool needed)
-6. Exclusion keywords ("제외", "빼고", "없이") have limited effectiveness in search engines
-   - Prefer positive phrasing: "고기 제외" → "채식 맛집", "매운음식 빼고" → "순한 음식"
-   - If exclusion is essential, keep it but note that results may not be perfectly filtered
-7. **Year handling in search queries**:
-   - If user specified a year (e.g., "2023년", "작년"), KEEP it as-is
-   - If user didn't specify a year but wants recent info ("최신", "요즘"), do NOT add years yourself
-   - Query Enhancer will automatically add appropriate year context when needed
-8. **Search tool input - NO KNOWLEDGE INJECTION**:
-   - For search tools (`web_search`, `rag_retrieve`, `search_wikipedia`), pass the query as-is
-   - Do NOT add your own knowledge/keywords (e.g., "RBAC", "베스트 프랙티스", "CNI")
-   - Query Enhancer handles optimization automatically
-   - Bad: "쿠버네티스 보안" → "쿠버네티스 보안 RBAC 네트워크 정책 베스트 프랙티스"
-   - Good: "쿠버네티스 보안" → "쿠버네티스 보안"
-
-{tool_manifest}
-
-## Handling Follow-up Questions
-When intent is "follow_up" (user asking for more/different results):
-- Pass user's query to search tools without modification
-- Query Enhancer will automatically diversify based on conversation history
-
-## Tool Chaining
-To use output from a previous step as input, use `input_from: "step_N"` (N = step_id).
-
-Search tools (`web_search`, `rag_retrieve`, `search_wikipedia`) automatically enhance queries using LLM.
-They understand user intent from context, so just pass raw data - no formatting needed.
-
-Example (multi-step with auto-enhancement):
-```json
-{{"steps": [
-  {{"step_id": 1, "tool": "calculator", "input": "100 * 1350", "task": "환율 계산"}},
-  {{"step_id": 2, "tool": "web_search", "input_from": "step_1", "task": "구매 가능 제품 검색"}}
-]}}
-```
-→ Step 2: "135000" + 사용자 맥락 → 자동으로 "135000원 전자제품 추천" 검색
-
-## Input Format
-- No input required: `"input": null`
-- String input: `"input": "query"`
-- Complex input: `"input": {{"param1": "value1"}}`
-
-## Output Format
-Return JSON strictly following this schema:
-{{
-  "steps": [
-    {{"step_id": 1, "tool": "tool_name", "input": "value", "task": "description"}},
-    ...
-  ],
-  "reasoning": "why this plan"
-}}"""
+## Request
+{user_input}"""
+
+
+def _find_first_step_json(text: str) -> str | None:
+    """스트리밍 중인 계획 텍스트에서 완성된 첫 step 객체 문자열 찾기.
+
+    "steps" 배열의 첫 번째 {...}가 닫혔으면 그 부분을 반환하고, 아직이면 None.
+    """
+    steps_pos = text.find('"steps"')
+    if steps_pos < 0:
+        return None
+    bracket = text.find("[", steps_pos)
+    start = text.find("{", bracket) if bracket >= 0 else -1
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _stream_plan_text(
+    llm: BaseChatModel,
+    messages_for_llm: list[BaseMessage],
+    on_first_step: Callable[[PlanStep], None],
+) -> str:
+    """계획을 스트리밍으로 받으며, 첫 step이 완성되는 즉시 on_first_step 호출.
+
+    Returns:
+        전체 응답 텍스트 (검증은 호출자가 기존과 동일하게 수행)
+    """
+    parts: list[str] = []
+    first_step_seen = False
+    for chunk in llm.stream(messages_for_llm):
+        if isinstance(chunk.content, str):
+            parts.append(chunk.content)
+        if first_step_seen:
+            continue
+        step_json = _find_first_step_json("".join(parts))
+        if step_json is None:
+            continue
+        first_step_seen = True
+        try:
+            on_first_step(PLAN_STEP_ADAPTER.validate_python(orjson.loads(step_json)))
+        except Exception:
+            pass  # prefetch는 최적화일 뿐 - 실패해도 전체 응답으로 계속 진행
+    return "".join(parts)
 
 
 def _format_intent_context(intent: str, original_input: str, rewritten_query: str) -> str:
@@ -142,22 +153,13 @@ def planner_node(state: PTEState) -> dict:
     messages = state["messages"]
     current_datetime = state["current_datetime"]
     tool_manifest = state["tool_manifest"]
-    available_tools = state["available_tools"]
     intent = state.get("intent", "new_question")
 
     # Intent 컨텍스트 포맷팅
     intent_context = _format_intent_context(intent, original_input, rewritten_query)
 
-    # 대화 히스토리 포맷팅 (최근 10개만)
-    history_text = "(없음)"
-    if messages:
-        recent_messages = messages[-10:]  # 최근 10개만
-        history_lines = []
-        for msg in recent_messages:
-            role = "사용자" if msg["role"] == "user" else "어시스턴트"
-            content = msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
-            history_lines.append(f"- {role}: {content}")
-        history_text = "\n".join(history_lines)
+    # 대화 히스토리 포맷팅 (최근 10개만, 주입된 값이 있으면 재사용)
+    history_text = state.get("conversation_history") or format_conversation_history(messages)
 
     # LLM 호출
     llm = get_llm(
@@ -165,49 +167,53 @@ def planner_node(state: PTEState) -> dict:
         temperature=settings.planner_temperature,
     )
 
-    system_prompt = PLANNER_PROMPT.format(
+    system_prompt = _build_system_prompt(tool_manifest)
+    input_text = PLANNER_INPUT_TEMPLATE.format(
         current_datetime=current_datetime,
         intent_context=intent_context,
         conversation_history=history_text,
-        tool_manifest=tool_manifest,
+        user_input=user_input,
     )
 
+    messages_for_llm = [
+        cached_system_message(system_prompt, model=settings.planner_model),
+        HumanMessage(content=input_text),
+    ]
+
     try:
-        # 일반 LLM 호출 후 수동 파싱
-        response = llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_input),
-        ])
-
-        # JSON 파싱 (마크다운 코드 블록 처리)
-        parsed = parse_json_response(response.content)
-        plan = Plan.model_validate(parsed)
-
-        # 계획 유효성 검사 및 정규화
-        plan_dicts = []
-        for idx, step in enumerate(plan.steps, 1):
-            # 허용된 도구인지 확인
-            if step.tool not in available_tools:
-                return {
-                    "error": f"허용되지 않은 도구: {step.tool}",
-                    "plan": [],
-                    "past_steps": [],
-                }
-
-            # step_id가 없으면 자동 부여
-            step_dict = step.model_dump()
-            if step_dict.get("step_id") is None:
-                step_dict["step_id"] = idx
-
-            # query를 input으로 정규화
-            if step_dict.get("query") and not step_dict.get("input"):
-                step_dict["input"] = step_dict["query"]
-
-            plan_dicts.append(step_dict)
+        if settings.structured_output:
+            # JSON Schema 강제 출력 (파싱 실패 시 수동 파싱으로 폴백)
+            plan, raw_text = invoke_structured(llm, Plan, messages_for_llm)
+            if plan is None:
+                plan = PLAN_ADAPTER.validate_python(parse_json_response(raw_text))
+        elif settings.streaming_planner:
+            # 첫 step이 완성되면 (검증 통과 시) 계획 완료 전에 미리 실행
+            def on_first_step(step: PlanStep) -> None:
+                prefetch_step(
+                    step.to_step_dict(1),
+                    original_input,
+                    messages,
+                    intent,
+                    state.get("time_sensitive", "none"),
+                )
+
+            response_text = _stream_plan_text(llm, messages_for_llm, on_first_step)
+            plan = PLAN_ADAPTER.validate_python(parse_json_response(response_text))
+        else:
+            # 일반 LLM 호출 후 수동 파싱
+            response = llm.invoke(messages_for_llm)
+
+            # JSON 파싱 (마크다운 코드 블록 처리)
+            parsed = parse_json_response(response.content)
+            plan = PLAN_ADAPTER.validate_python(parsed)
+
+        # 도구 허용 여부는 PlanStep 검증에서 확인됨 - 여기서는 정규화만
+        plan_dicts = [step.to_step_dict(idx) for idx, step in enumerate(plan.steps, 1)]
 
         return {
             "plan": plan_dicts,
             "past_steps": [],
+            "past_steps_by_id": {},
             "replan_count": 0,
             "error": None,
         }
@@ -218,4 +224,68 @@ def planner_node(state: PTEState) -> dict:
             "error": f"계획 생성 실패: {e}",
             "plan": [],
             "past_steps": [],
+            "past_steps_by_id": {},
         }
+
+
+# =============================================================================
+# Speculative Planning (intent_classifier와 병렬 실행)
+# =============================================================================
+
+
+def speculative_planner_node(state: PTEState) -> dict:
+    """intent 분류를 기다리지 않고 "새 질문"으로 가정해 미리 계획 생성.
+
+    결과는 speculative_plan에만 저장하고, 채택 여부는 speculation_join_node가 결정한다.
+    후속 대화(재작성된 이전 질문 존재)나 fast path로 분류되는 입력은 추측이
+    채택될 가능성이 낮으므로 LLM 호출 없이 건너뛴다.
+
+    Args:
+        state: 현재 상태 (intent 미확정)
+
+    Returns:
+        speculative_plan이 설정된 상태 업데이트 (건너뛰면 None)
+    """
+    has_history = bool(state.get("messages"))
+    if (
+        state.get("previous_rewritten_query")
+        or _match_fast_path(state["input"], has_history) is not None
+    ):
+        return {"speculative_plan": None}
+
+    assumed_state = {
+        **state,
+        "intent": "new_question",
+        "rewritten_query": state["input"],
+    }
+    return {"speculative_plan": planner_node(assumed_state)}
+
+
+def should_adopt_speculative_plan(state: PTEState) -> bool:
+    """추측 계획이 실제 planner 결과와 같은 입력으로 만들어졌는지 확인.
+
+    intent가 new_question이고 질문이 재작성되지 않았을 때만 planner 프롬프트가 동일하다.
+    """
+    return (
+        state.get("speculative_plan") is not None
+        and state.get("needs_tool", True)
+        and state.get("intent") == "new_question"
+        and state.get("rewritten_query") in ("", state["input"])
+    )
+
+
+def speculation_join_node(state: PTEState) -> dict:
+    """intent_classifier와 speculative_planner 합류 지점.
+
+    추측 계획을 채택할 수 있으면 planner 결과로 반영하고, 아니면 버린다.
+
+    Args:
+        state: 현재 상태
+
+    Returns:
+        (채택 시) plan이 설정된 상태 업데이트
+    """
+    if should_adopt_speculative_plan(state):
+        # speculative_plan은 유지 (after_speculation_join이 채택 여부 판단에 사용)
+        return dict(state["speculative_plan"])
+    return {"speculative_plan": None}
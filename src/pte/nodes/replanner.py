@@ -8,30 +8,32 @@
 - 새로운 고위험 tool 추가 금지
 """
 
-import json
-import re
+import functools
 
-from langchain_core.messages import HumanMessage, SystemMessage
+import orjson
 
-from src.llm import get_llm
+from langchain_core.messages import HumanMessage
+
+from src.llm import get_llm, cached_system_message, invoke_structured
 from src.config import settings
+from src.pte.prompts import load_prompt
 from src.pte.state import PTEState
-from src.pte.schemas import Plan
+from src.pte.nodes._json_utils import parse_json_response
+from src.pte.schemas import PLAN_ADAPTER, Plan
 from src.pte.tool_groups import is_tool_allowed_for_replan
 
 
-def parse_json_response(text: str) -> dict:
-    """LLM 응답에서 JSON 추출."""
-    text = text.strip()
-    if text.startswith("```"):
-        text = re.sub(r"^```(?:json)?\s*\n?", "", text)
-        text = re.sub(r"\n?```$", "", text)
-    return json.loads(text)
+@functools.lru_cache(maxsize=4)
+def _build_system_prompt(tool_manifest: str) -> str:
+    """정적 system 프롬프트 (prompts/replanner.txt + tool_manifest, 프롬프트 캐시 대상).
 
+    tool_manifest는 배포 단위로 고정이므로 결과를 재사용한다.
+    """
+    return load_prompt("replanner").replace("{tool_manifest}", tool_manifest)
 
-REPLANNER_PROMPT = """You are a Re-planner that fixes failed execution plans.
 
-## Current Time
+# 동적 입력 (매 호출 변경, human 메시지로 전달)
+REPLANNER_INPUT_TEMPLATE = """## Current Time
 {current_datetime}
 
 ## Failure Information
@@ -43,30 +45,7 @@ Execution history:
 Remaining plan:
 {remaining_plan}
 
-## Rules
-1. Analyze the failure cause
-2. Modify the plan with alternative approaches
-3. HIGH-risk tools (python_repl, etc.) cannot be newly added
-4. You can reuse results from successful steps
-
-{tool_manifest}
-
-## Tool Chaining
-To use output from a previous step, use `input_from: "step_N"` (N = step_id).
-
-Search tools automatically enhance queries - just pass raw data via `input_from`.
-
-## Input Format
-- No input required: `"input": null`
-- String input: `"input": "query"`
-- Complex input: `"input": {{"param1": "value1"}}`
-
-## Output Format
-Return the modified plan in JSON:
-{{
-  "steps": [...],
-  "reasoning": "why this modification"
-}}"""
+위 실패를 분석하고 수정된 계획을 JSON 형식으로 제시해주세요."""
 
 
 def replanner_node(state: PTEState) -> dict:
@@ -105,38 +84,40 @@ def replanner_node(state: PTEState) -> dict:
         temperature=settings.replanner_temperature,
     )
 
-    system_prompt = REPLANNER_PROMPT.format(
+    system_prompt = _build_system_prompt(state["tool_manifest"])
+    input_text = REPLANNER_INPUT_TEMPLATE.format(
         current_datetime=state["current_datetime"],
         original_input=state["input"],
         past_steps=past_steps_text or "(없음)",
         remaining_plan=remaining_plan_text or "(없음)",
-        tool_manifest=state["tool_manifest"],
     )
 
+    messages_for_llm = [
+        cached_system_message(system_prompt, model=settings.replanner_model),
+        HumanMessage(content=input_text),
+    ]
+
     try:
-        # 일반 LLM 호출 후 수동 파싱
-        response = llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content="위 실패를 분석하고 수정된 계획을 JSON 형식으로 제시해주세요."),
-        ])
-
-        # JSON 파싱
-        try:
-            parsed = parse_json_response(response.content)
-        except json.JSONDecodeError as e:
-            return {"error": f"Re-planner JSON 파싱 실패: {e}\n응답: {response.content[:200]}"}
-
-        plan = Plan.model_validate(parsed)
-
-        # 새 계획 유효성 검사
-        available_tools = state["available_tools"]
+        if settings.structured_output:
+            # JSON Schema 강제 출력 (파싱 실패 시 수동 파싱으로 폴백)
+            plan, response_text = invoke_structured(llm, Plan, messages_for_llm)
+        else:
+            # 일반 LLM 호출 후 수동 파싱
+            plan, response_text = None, llm.invoke(messages_for_llm).content
+
+        if plan is None:
+            # JSON 파싱
+            try:
+                parsed = parse_json_response(response_text)
+            except orjson.JSONDecodeError as e:
+                return {"error": f"Re-planner JSON 파싱 실패: {e}\n응답: {response_text[:200]}"}
+
+            plan = PLAN_ADAPTER.validate_python(parsed)
+
+        # 새 계획 유효성 검사 (도구 허용 여부는 PlanStep 검증에서 확인됨)
         plan_dicts = []
 
         for idx, step in enumerate(plan.steps, 1):
-            # 허용된 도구인지 확인
-            if step.tool not in available_tools:
-                return {"error": f"허용되지 않은 도구: {step.tool}"}
-
             # 고위험 도구 추가 제한
             if not is_tool_allowed_for_replan(step.tool):
                 # 기존 계획에 있던 도구인지 확인
@@ -147,16 +128,8 @@ def replanner_node(state: PTEState) -> dict:
                 if not was_in_original:
                     return {"error": f"Re-plan에서 고위험 도구 추가 불가: {step.tool}"}
 
-            # step_id가 없으면 자동 부여
-            step_dict = step.model_dump()
-            if step_dict.get("step_id") is None:
-                step_dict["step_id"] = idx
-
-            # query를 input으로 정규화
-            if step_dict.get("query") and not step_dict.get("input"):
-                step_dict["input"] = step_dict["query"]
-
-            plan_dicts.append(step_dict)
+            # step_id 자동 부여, query를 input으로 정규화
+            plan_dicts.append(step.to_step_dict(idx))
 
         return {
             "plan": plan_dicts,
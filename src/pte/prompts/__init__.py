@@ -0,0 +1,23 @@
+"""PTE 노드 프롬프트 (텍스트 파일).
+
+프롬프트 본문은 같은 디렉터리의 {name}.txt에 두고, 최초 사용 시 1회만 읽는다.
+"""
+
+import functools
+from importlib import resources
+
+
+@functools.lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """프롬프트 텍스트 로드 (프로세스당 1회).
+
+    Args:
+        name: 프롬프트 이름 (확장자 제외, 예: "planner")
+
+    Returns:
+        프롬프트 문자열 (끝 줄바꿈 제외)
+    """
+    return resources.files(__name__).joinpath(f"{name}.txt").read_text(encoding="utf-8").rstrip("\n")
+
+
+__all__ = ["load_prompt"]
@@ -6,7 +6,21 @@
 - task는 설명용(optional)
 """
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+from src.pte.tool_groups import get_available_tools
+
+
+# plan에 허용되는 도구 이름 (기본값: 정의된 모든 도구)
+_ALLOWED_TOOLS: frozenset[str] = frozenset(get_available_tools())
+
+
+def set_allowed_tools(names) -> None:
+    """PlanStep 검증 시 허용할 도구 이름 집합 설정 (앱 시작 시 호출)."""
+    global _ALLOWED_TOOLS
+    _ALLOWED_TOOLS = frozenset(names)
 
 
 class PlanStep(BaseModel):
@@ -28,10 +42,28 @@ class PlanStep(BaseModel):
     input_from: str | None = Field(default=None, description="이전 step output 참조")
     task: str | None = Field(default=None, description="작업 설명 (선택)")
 
+    @field_validator("tool")
+    @classmethod
+    def _check_tool_allowed(cls, v: str) -> str:
+        """허용되지 않은 도구는 검증 단계에서 바로 거부 (fail-closed)."""
+        if v not in _ALLOWED_TOOLS:
+            raise ValueError(f"허용되지 않은 도구: {v}")
+        return v
+
     def get_input(self) -> str | dict | None:
         """실제 입력값 반환 (input 또는 query)."""
         return self.input or self.query
 
+    def to_step_dict(self, default_step_id: int) -> dict:
+        """Executor용 step dict 생성 (step_id 자동 부여, query → input 정규화)."""
+        return {
+            "step_id": self.step_id if self.step_id is not None else default_step_id,
+            "tool": self.tool,
+            "input": self.get_input(),
+            "input_from": self.input_from,
+            "task": self.task,
+        }
+
 
 class Plan(BaseModel):
     """실행 계획.
@@ -45,6 +77,11 @@ class Plan(BaseModel):
     reasoning: str | None = Field(default=None, description="계획 수립 이유")
 
 
+# 검증기 재사용 (planner/replanner 응답 검증용)
+PLAN_ADAPTER: TypeAdapter[Plan] = TypeAdapter(Plan)
+PLAN_STEP_ADAPTER: TypeAdapter[PlanStep] = TypeAdapter(PlanStep)
+
+
 class ReplanPatch(BaseModel):
     """재계획 패치.
 
@@ -68,3 +105,27 @@ class Replan(BaseModel):
     patches: list[ReplanPatch] | None = Field(default=None, description="패치 목록")
     new_plan: Plan | None = Field(default=None, description="새 계획 (전체 교체 시)")
     analysis: str = Field(description="실패 원인 분석")
+
+
+class IntentClassification(BaseModel):
+    """Intent classifier 구조화 출력.
+
+    Attributes:
+        reasoning: 분류 근거 (CoT, 디버깅용)
+        intent: 질문 의도
+        constraints: 사용자가 명시한 제약 조건
+        time_sensitive: 시간 민감도
+        rewritten_query: 맥락을 반영해 재작성한 질문
+        needs_tool: 도구 사용 필요 여부
+    """
+
+    reasoning: str = Field(description="분류 근거 (단계별 분석)")
+    intent: Literal["new_question", "follow_up", "clarification", "chitchat"] = Field(
+        description="질문 의도"
+    )
+    constraints: str = Field(default="", description="사용자 제약 조건 (없으면 빈 문자열)")
+    time_sensitive: Literal["none", "current", "specified"] = Field(
+        default="none", description="시간 민감도"
+    )
+    rewritten_query: str = Field(description="재작성된 질문")
+    needs_tool: bool = Field(description="도구 사용 필요 여부")
@@ -15,6 +15,7 @@ class PTEState(TypedDict):
     Attributes:
         input: 사용자 요청 원문
         messages: 대화 히스토리 [{"role": "user"|"assistant", "content": "..."}]
+        conversation_history: 프롬프트용으로 포맷된 최근 대화 히스토리 (노드 간 재사용)
         previous_rewritten_query: 이전 턴의 재작성된 쿼리 (맥락 유지용)
         current_datetime: 현재 날짜/시간 (KST)
         tool_manifest: 사용 가능한 도구 목록 (텍스트)
@@ -22,8 +23,10 @@ class PTEState(TypedDict):
         intent: 질문 의도 (follow_up, new_question, chitchat, clarification)
         rewritten_query: 명확하게 재작성된 질문
         needs_tool: 도구 사용 필요 여부
+        speculative_plan: intent 분류와 병렬로 미리 생성한 planner 결과 (채택 전)
         plan: 실행 대기 중인 step 목록 [{step_id, tool, input, task?}]
         past_steps: 실행 완료된 step과 결과 [{step, status, output}]
+        past_steps_by_id: step_id → past_steps 항목 (input_from 조회용 인덱스)
         replan_count: 재계획 횟수 (무한 루프 방지)
         error: 에러 메시지 (있으면 Fail-closed)
         result: 사용자에게 반환할 최종 결과
@@ -34,6 +37,7 @@ class PTEState(TypedDict):
 
     # 대화 히스토리 (주입)
     messages: list[dict[str, str]]
+    conversation_history: str
 
     # 이전 턴의 재작성된 쿼리 (주입, 맥락 유지용)
     previous_rewritten_query: str | None
@@ -43,7 +47,7 @@ class PTEState(TypedDict):
 
     # 도구 (주입)
     tool_manifest: str
-    available_tools: list[str]
+    available_tools: tuple[str, ...]
 
     # 의도 분류 (Intent Classifier 결과)
     intent: str  # follow_up, new_question, chitchat, clarification
@@ -52,10 +56,12 @@ class PTEState(TypedDict):
     time_sensitive: str  # none, current, specified
 
     # 계획
+    speculative_plan: dict[str, Any] | None
     plan: list[dict[str, Any]]
 
     # 실행 로그
     past_steps: list[dict[str, Any]]
+    past_steps_by_id: dict[int, dict[str, Any]]
 
     # 제어
     replan_count: int
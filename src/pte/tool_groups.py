@@ -6,6 +6,7 @@
 - 위험도별 접근 제어
 """
 
+import functools
 from enum import Enum
 from dataclasses import dataclass
 
@@ -130,13 +131,18 @@ def is_tool_allowed_for_replan(tool_name: str) -> bool:
     return get_tool_risk(tool_name) != ToolRiskLevel.HIGH
 
 
-def get_available_tools() -> list[str]:
-    """사용 가능한 도구 이름 목록."""
-    return list(TOOL_DEFINITIONS.keys())
+@functools.lru_cache(maxsize=1)
+def get_available_tools() -> tuple[str, ...]:
+    """사용 가능한 도구 이름 목록 (불변 tuple, 호출 간 공유)."""
+    return tuple(TOOL_DEFINITIONS)
 
 
+@functools.lru_cache(maxsize=1)
 def get_tool_manifest_text() -> str:
-    """Planner 프롬프트에 넣을 도구 설명 (입출력 스키마 포함)."""
+    """Planner 프롬프트에 넣을 도구 설명 (입출력 스키마 포함).
+
+    TOOL_DEFINITIONS는 런타임에 바뀌지 않으므로 최초 1회만 생성한다.
+    """
     lines = ["사용 가능한 도구:", ""]
 
     risk_emoji = {
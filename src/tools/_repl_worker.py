@@ -0,0 +1,74 @@
+"""python_repl 워커 프로세스.
+
+부모 프로세스(python_repl)가 이 파일을 별도 인터프레터로 실행한다.
+stdin으로 JSON 한 줄({"code": ...})을 받아 실행하고,
+결과를 JSON 한 줄({"output": ..., "error": ...})로 돌려준다.
+한 번 import한 모듈은 프로세스가 살아 있는 동안 재사용된다.
+"""
+
+import json
+import os
+import sys
+from collections import OrderedDict
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from types import CodeType
+
+# 같은 코드 반복 실행 시 파싱/컴파일 생략 (LRU)
+_CODE_CACHE_SIZE = 128
+_code_cache: OrderedDict[str, CodeType] = OrderedDict()
+
+
+def _open_protocol_streams():
+    """프로토콜용 stdin/stdout을 별도 fd로 분리.
+
+    실행 코드가 print/input이나 fd 0/1을 직접 써도 프로토콜이 깨지지 않도록
+    원래 fd 0/1은 devnull로 돌려놓는다.
+    """
+    proto_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    proto_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    sys.stdin = open(os.devnull, encoding="utf-8")
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    return proto_in, proto_out
+
+
+def _compile(code: str) -> CodeType:
+    compiled = _code_cache.get(code)
+    if compiled is not None:
+        _code_cache.move_to_end(code)
+        return compiled
+    compiled = compile(code, "<string>", "exec")
+    _code_cache[code] = compiled
+    if len(_code_cache) > _CODE_CACHE_SIZE:
+        _code_cache.popitem(last=False)
+    return compiled
+
+
+def _run(code: str) -> dict:
+    buffer = StringIO()
+    try:
+        compiled = _compile(code)
+        # 경고(warnings) 등 stderr 출력도 결과에 포함
+        with redirect_stdout(buffer), redirect_stderr(buffer):
+            exec(compiled, {"__builtins__": __builtins__, "__name__": "__main__"})
+    except BaseException as e:  # SystemExit 등도 워커를 죽이지 않고 오류로 반환
+        return {"output": "", "error": f"{type(e).__name__}: {e}"}
+    return {"output": buffer.getvalue(), "error": None}
+
+
+def main() -> None:
+    # 스크립트 디렉터리(src/tools)가 sys.path에 들어가 도구 모듈이 import되는 것을 방지
+    sys.path.pop(0)
+    proto_in, proto_out = _open_protocol_streams()
+    for line in proto_in:
+        request = json.loads(line)
+        proto_out.write(json.dumps(_run(request["code"]), ensure_ascii=False) + "\n")
+        proto_out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,97 @@
 """Calculator tool."""
 
+import ast
+import functools
 import math
 
 
+# 안전한 수학 함수/상수만 허용
+_ALLOWED_NAMESPACE = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "pow": pow,
+    "sqrt": math.sqrt,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "log": math.log,
+    "log10": math.log10,
+    "pi": math.pi,
+    "e": math.e,
+}
+
+# 수식에 허용되는 AST 노드 (속성 접근, 람다, 컴프리헨션 등은 차단)
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Call,
+    ast.keyword,
+    ast.Compare,
+    ast.IfExp,
+    ast.BoolOp,
+    ast.Name,
+    ast.Load,
+    ast.List,
+    ast.Tuple,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.USub,
+    ast.UAdd,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.And,
+    ast.Or,
+    ast.Not,
+)
+
+
+def _compile_expression(expression: str):
+    """수식을 검증 후 컴파일.
+
+    Raises:
+        SyntaxError: 수식 문법 오류
+        ValueError: 허용되지 않은 연산/이름 사용
+    """
+    tree = ast.parse(expression.strip(), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"허용되지 않은 연산: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in _ALLOWED_NAMESPACE:
+            raise ValueError(f"허용되지 않은 이름: {node.id}")
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            raise ValueError("허용되지 않은 함수 호출")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"허용되지 않은 값: {node.value!r}")
+    return compile(tree, "<calculator>", "eval")
+
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate(expression: str) -> str:
+    """수식 계산 결과 (같은 수식은 재계산하지 않음).
+
+    수식에는 변수가 없고 허용된 함수는 모두 순수 함수이므로
+    결과 자체를 캐시해도 안전하다. 예외는 캐시되지 않는다.
+    """
+    code = _compile_expression(expression)
+    return str(eval(code, {"__builtins__": {}}, _ALLOWED_NAMESPACE))
+
+
 def calculator(expression: str) -> str:
     """수학 계산을 수행합니다.
 
@@ -13,25 +102,6 @@ def calculator(expression: str) -> str:
         계산 결과
     """
     try:
-        # 안전한 수학 함수들만 허용
-        allowed_names = {
-            "abs": abs,
-            "round": round,
-            "min": min,
-            "max": max,
-            "sum": sum,
-            "pow": pow,
-            "sqrt": math.sqrt,
-            "sin": math.sin,
-            "cos": math.cos,
-            "tan": math.tan,
-            "log": math.log,
-            "log10": math.log10,
-            "pi": math.pi,
-            "e": math.e,
-        }
-
-        result = eval(expression, {"__builtins__": {}}, allowed_names)
-        return str(result)
+        return _evaluate(expression)
     except Exception as e:
         return f"계산 오류: {e}"
@@ -1,7 +1,9 @@
 """Datetime tool."""
 
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
+
+_KST = ZoneInfo("Asia/Seoul")
 
 
 def get_current_datetime() -> str:
@@ -10,6 +12,5 @@ def get_current_datetime() -> str:
     Returns:
         현재 날짜/시간 문자열 (KST 기준)
     """
-    kst = pytz.timezone("Asia/Seoul")
-    now = datetime.now(kst)
+    now = datetime.now(_KST)
     return now.strftime("%Y년 %m월 %d일 %H시 %M분 %S초 (KST)")
@@ -1,7 +1,93 @@
 """Python REPL tool."""
 
+import atexit
+import json
+import queue
+import subprocess
 import sys
-from io import StringIO
+import threading
+from pathlib import Path
+
+from src.config import settings
+
+_WORKER_PATH = Path(__file__).with_name("_repl_worker.py")
+
+
+class _ReplWorker:
+    """코드를 실행하는 상주 서브프로세스.
+
+    에이전트 프로세스의 전역 상태/stdout과 분리되고, import한 모듈이 유지된다.
+    """
+
+    def __init__(self) -> None:
+        self._proc = subprocess.Popen(
+            [sys.executable, str(_WORKER_PATH)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+        self._responses: queue.Queue[str | None] = queue.Queue()
+        threading.Thread(target=self._read_responses, daemon=True).start()
+
+    def _read_responses(self) -> None:
+        for line in self._proc.stdout:
+            self._responses.put(line)
+        self._responses.put(None)  # 워커 종료
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def run(self, code: str, timeout: float) -> dict:
+        """코드 실행 결과 반환.
+
+        Raises:
+            TimeoutError: timeout 내에 응답이 없음 (워커는 종료됨)
+            RuntimeError: 워커가 비정상 종료됨
+        """
+        self._proc.stdin.write(json.dumps({"code": code}, ensure_ascii=False) + "\n")
+        self._proc.stdin.flush()
+        try:
+            line = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            self.close()
+            raise TimeoutError(f"{timeout:g}초 안에 실행이 끝나지 않았습니다") from None
+        if line is None:
+            raise RuntimeError("실행 프로세스가 비정상 종료되었습니다")
+        return json.loads(line)
+
+    def close(self) -> None:
+        if self.alive:
+            self._proc.kill()
+        self._proc.wait()
+
+
+_worker: _ReplWorker | None = None
+_worker_lock = threading.Lock()
+
+
+def _close_worker() -> None:
+    if _worker is not None:
+        _worker.close()
+
+
+atexit.register(_close_worker)
+
+
+def _run_in_worker(code: str) -> dict:
+    """상주 워커에서 코드 실행 (동시 호출은 순서대로 처리)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.alive:
+            _worker = _ReplWorker()
+        try:
+            return _worker.run(code, settings.python_repl_timeout)
+        except (OSError, RuntimeError):
+            # 파이프가 끊긴 경우 다음 호출에서 새 워커 생성
+            _worker.close()
+            raise
 
 
 def python_repl(code: str) -> str:
@@ -13,24 +99,15 @@ def python_repl(code: str) -> str:
     Returns:
         실행 결과 또는 출력
     """
-    # stdout 캡처
-    old_stdout = sys.stdout
-    sys.stdout = StringIO()
-
     try:
-        # 코드 실행
-        exec_globals = {"__builtins__": __builtins__}
-        exec(code, exec_globals)
-
-        # 출력 가져오기
-        output = sys.stdout.getvalue()
-
-        if output:
-            return output.strip()
-        return "코드가 실행되었습니다. (출력 없음)"
-
+        result = _run_in_worker(code)
     except Exception as e:
         return f"실행 오류: {type(e).__name__}: {e}"
 
-    finally:
-        sys.stdout = old_stdout
+    if result["error"]:
+        return f"실행 오류: {result['error']}"
+
+    output = result["output"]
+    if output:
+        return output.strip()
+    return "코드가 실행되었습니다. (출력 없음)"
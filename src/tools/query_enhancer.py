@@ -1,38 +1,150 @@
-"""LLM-based query enhancement for search tools."""
-
-import json
+"""LLM-based query enhancement for search tools.
+
+Performance note: this module is I/O-bound. The LLM round trip dominates,
+and the local work is short string formatting and regex parsing. JIT
+compilers such as Numba or Cython do not help here, because Numba cannot
+compile str/regex code in nopython mode and its object-mode fallback is
+no faster than CPython. Look instead at result caching, LLM-free fast
+paths, async/concurrent calls, stable prompt prefixes for provider
+prompt caches, and shorter model output.
+"""
+
+import functools
+import logging
 import re
+import time
+import zlib
+from bisect import bisect_right
 from datetime import datetime
-
-from langchain_core.messages import HumanMessage, SystemMessage
-
-from src.llm import get_llm
+from itertools import accumulate
+from typing import NamedTuple
+
+import orjson
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from src.cache import (
+    CacheBackend,
+    CacheStats,
+    SemanticCache,
+    get_cache,
+    get_semantic_cache,
+    query_enhancement_cache_key,
+)
+from src.llm import get_llm, cached_system_message, get_embedding
 from src.config import settings
 
+logger = logging.getLogger(__name__)
+
+# 응답 파싱용 정규식 (매 호출 재컴파일 방지)
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+# URL/연도 탐지를 한 번의 스캔으로 처리
+_QUERY_SCAN_RE = re.compile(r'(?P<url>https?://\S)|(?P<year>\b(?:19|20)\d{2}\b)')
+_SEARCH_QUERY_RE = re.compile(r'Search query:\s*(.+?)(?:\n|---|$)', re.IGNORECASE)
+_SEARCH_QUERY_DONE_RE = re.compile(r'Search query:[^\n]*\S[^\n]*\n', re.IGNORECASE)
+_COVERED_RE = re.compile(r'Already covered:\s*(.+?)(?:\n|---|$)', re.IGNORECASE)
+_DIVERSIFY_RE = re.compile(
+    r'(?:Diversify by|New direction|New angle):\s*(.+?)(?:\n|---|$)', re.IGNORECASE
+)
+_CORE_INTENT_RE = re.compile(r'Core intent:\s*(.+?)(?:\n|---|$)', re.IGNORECASE)
+_USER_WANTS_RE = re.compile(r'User wants:\s*(.+?)(?:\n|---|$)', re.IGNORECASE)
+# 코드 블록 내용만 캡처 (닫는 ```가 없어도 여는 부분은 제거)
+_CODEFENCE_RE = re.compile(r"^```(?:json)?\s*\n?(.*?)\n?(?:```)?\s*$", re.DOTALL)
+_QUERY_JSON_RE = re.compile(r'"query"\s*:\s*"([^"]+)"')
+_SENTENCES_JSON_RE = re.compile(r'"sentences"\s*:\s*(\d+)')
+_SINGLE_TERM_RE = re.compile(r'[\w·-]{1,20}')
+
+# 이 길이 이하의 새 질문 쿼리는 이미 간결하므로 LLM 증강 생략
+_TRIVIAL_QUERY_MAX_LEN = 8
+# 이 토큰 수 이상이고 지시어가 없는 쿼리는 그 자체로 완결된 것으로 보고 증강 생략
+_SELF_CONTAINED_MIN_TOKENS = 4
+# 지시어: 한국어는 조사가 붙으므로 부분 문자열, 영어는 토큰 단위로 확인
+_ANAPHORA_KO = ("이거", "저거", "그거", "이것", "저것", "그것")
+_ANAPHORA_EN = frozenset({"this", "that", "it", "they", "them", "these", "those"})
+
 
 # =============================================================================
 # Year Hint Utilities (연초 방어 로직)
 # =============================================================================
 
+# 분 단위 포맷이므로 같은 분 안에서는 이전 문자열 재사용
+_last_minute: int | None = None
+_last_datetime_str = ""
+_last_year_hint = ""
+
+
+def _refresh_time_strings() -> None:
+    global _last_minute, _last_datetime_str, _last_year_hint
+    now = time.time()
+    minute = int(now // 60)
+    if minute != _last_minute:
+        dt = datetime.fromtimestamp(now)
+        _last_datetime_str = dt.strftime("%Y-%m-%d %H:%M (%A)")
+        # 1~3월에는 이전 연도~현재 연도 범위
+        _last_year_hint = f"{dt.year - 1}~{dt.year}" if dt.month <= 3 else str(dt.year)
+        _last_minute = minute
+
+
+def _current_dt_string() -> str:
+    """프롬프트용 현재 시각 문자열 (분 단위 캐시)."""
+    _refresh_time_strings()
+    return _last_datetime_str
+
+
 def _get_year_hint() -> str:
     """연초 방어를 위한 연도 힌트 생성.
 
     1~3월에는 이전 연도~현재 연도 범위를 반환.
     """
-    now = datetime.now()
-    if now.month <= 3:
-        return f"{now.year - 1}~{now.year}"
-    return str(now.year)
+    _refresh_time_strings()
+    return _last_year_hint
 
 
 def _has_year_in_query(query: str) -> bool:
     """쿼리에 이미 연도가 포함되어 있는지 확인 (방어적 체크)."""
-    return bool(re.search(r'\b(19|20)\d{2}\b', query))
+    return _YEAR_RE.search(query) is not None
+
+
+def _scan_query(query: str) -> tuple[bool, bool]:
+    """쿼리의 (URL 포함 여부, 연도 포함 여부)를 한 번에 확인.
+
+    URL이 있으면 연도 여부는 쓰이지 않으므로 바로 반환한다.
+    """
+    has_year = False
+    for match in _QUERY_SCAN_RE.finditer(query):
+        if match.lastgroup == "url":
+            return True, has_year
+        has_year = True
+    return False, has_year
+
+
+def _is_trivial_web_query(query: str, context: str | None, intent: str, time_sensitive: str) -> bool:
+    """LLM 증강으로 달라질 것이 없는 Web Search 쿼리인지 확인.
+
+    follow_up(다양화 필요)과 연도를 붙여야 하는 current 쿼리는 제외하고,
+    이미 짧은 쿼리이거나 참고할 사용자 요청이 없으면 그대로 사용한다.
+    """
+    if intent == "follow_up":
+        return False
+    if time_sensitive == "current":
+        return False
+    if not context or len(query) <= _TRIVIAL_QUERY_MAX_LEN:
+        return True
+    return _is_self_contained_query(query)
 
 
-def _has_url_in_query(query: str) -> bool:
-    """쿼리에 URL이 포함되어 있는지 확인."""
-    return bool(re.search(r'https?://[^\s]+', query))
+def _is_self_contained_query(query: str) -> bool:
+    """충분히 길고 지시어가 없어 사용자 요청 없이도 검색 가능한 쿼리인지 확인."""
+    tokens = query.lower().split()
+    if len(tokens) < _SELF_CONTAINED_MIN_TOKENS:
+        return False
+    if any(term in query for term in _ANAPHORA_KO):
+        return False
+    return _ANAPHORA_EN.isdisjoint(token.strip(".,?!'\"") for token in tokens)
+
+
+def _is_trivial_wikipedia_query(query: str, context: str | None, intent: str) -> bool:
+    """단일 용어 쿼리이고 참고할 사용자 요청이 없으면 최적화 생략."""
+    return intent != "follow_up" and not context and _SINGLE_TERM_RE.fullmatch(query) is not None
 
 
 # =============================================================================
@@ -40,12 +152,10 @@ def _has_url_in_query(query: str) -> bool:
 # =============================================================================
 
 # 새로운 질문용 프롬프트 - CoT 방식
+# 정적 부분(규칙 + 예시)은 system, 입력은 human 메시지로 분리 (프롬프트 캐시 유지)
+# year_rule/year_example은 time_sensitive별로 고정이므로 system에 둔다.
 WEB_SEARCH_NEW_QUESTION_PROMPT = """You are a web search query optimizer.
-
-## Input
-- Query: {query}
-- User's request: {context}
-- Current time: {current_datetime}
+The input (query, user's request, current time) is given in the user message.
 
 ## Rules
 - CONCISE IS BETTER: Keep query short (under 30 characters ideal, max 50)
@@ -57,28 +167,38 @@ WEB_SEARCH_NEW_QUESTION_PROMPT = """You are a web search query optimizer.
 {year_rule}
 
 ## Output format:
----
-Core intent: [one line]
-Search query: [SHORT query]
----
+{output_format}
 
 ## Example
 {year_example}"""
 
+# Core intent 추론 포함 출력 (QUERY_ENHANCE_COT=true, 디버깅용)
+_NEW_QUESTION_COT_FORMAT = """---
+Core intent: [one line]
+Search query: [SHORT query]
+---"""
 
-# 후속 질문용 프롬프트 - CoT 방식 (다양화 전략)
-WEB_SEARCH_FOLLOW_UP_PROMPT = """You are a web search query optimizer for FOLLOW-UP questions.
-
-## Goal: Find DIFFERENT results than what's already discussed
+# 검색어 한 줄만 출력 (기본값, 출력 토큰 최소화)
+_NEW_QUESTION_LEAN_FORMAT = """Output ONLY this one line, nothing else:
+Search query: [SHORT query]"""
 
-## Conversation History
-{history}
+# lean 형식의 응답은 한 줄이므로 출력 토큰 상한을 둔다
+_LEAN_MAX_TOKENS = 64
 
-## Current Request
+WEB_SEARCH_NEW_QUESTION_INPUT = """## Input
 - Query: {query}
 - User's request: {context}
 - Current time: {current_datetime}
 
+Query to optimize: {query}"""
+
+
+# 후속 질문용 프롬프트 - CoT 방식 (다양화 전략)
+WEB_SEARCH_FOLLOW_UP_PROMPT = """You are a web search query optimizer for FOLLOW-UP questions.
+
+## Goal: Find DIFFERENT results than what's already discussed
+The conversation history and current request are given in the user message.
+
 ## Diversification Strategy (pick one that fits)
 1. **Category shift**: 한식→양식, 카페→베이커리, 프론트엔드→백엔드
 2. **Attribute change**: 가성비→분위기, 기능→성능, 초보자용→고급
@@ -117,11 +237,83 @@ Search query: 웹 프레임워크 Svelte Angular
 
 {year_example}"""
 
+WEB_SEARCH_FOLLOW_UP_INPUT = """## Conversation History
+{history}
+
+## Current Request
+- Query: {query}
+- User's request: {context}
+- Current time: {current_datetime}
+
+Query to optimize: {query}"""
+
 
 # 기존 프롬프트 (fallback용으로 유지)
 WEB_SEARCH_ENHANCE_PROMPT = WEB_SEARCH_NEW_QUESTION_PROMPT
 
 
+def _year_rule(time_sensitive: str, year_hint: str) -> str:
+    """time_sensitive에 따른 연도 처리 규칙 (프롬프트 Rules 항목)."""
+    if time_sensitive == "current":
+        return f'- IMPORTANT: Add "{year_hint}" at the START of the search query for recency'
+    if time_sensitive == "specified":
+        return "- IMPORTANT: User specified a year/period. PRESERVE it exactly as given. Do NOT add or change the year."
+    return ""
+
+
+@functools.lru_cache(maxsize=8)
+def _build_web_search_system_prompt(
+    follow_up: bool, time_sensitive: str, year_hint: str, cot: bool = False
+) -> str:
+    """Web Search 증강용 정적 system 프롬프트 (time_sensitive, 연도별로 고정).
+
+    Args:
+        follow_up: 후속 질문용 프롬프트 사용 여부
+        time_sensitive: 시간 민감도 (none, current, specified)
+        year_hint: 연도 힌트 (current일 때만 사용)
+        cot: 새 질문에서도 Core intent 추론을 출력할지 여부
+
+    Returns:
+        year_rule/year_example이 채워진 프롬프트
+    """
+    if time_sensitive == "current":
+        year_example = f"""Query: "요즘 핫한 카페"
+---
+Core intent: 최근 인기 있는 카페 찾기
+Search query: {year_hint} 인기 카페
+---"""
+    elif time_sensitive == "specified":
+        year_example = """Query: "2020~2024년 인기 카페"
+---
+Core intent: 2020~2024년 사이 인기 있던 카페 찾기
+Search query: 2020~2024년 인기 카페
+---"""
+    else:  # none
+        year_example = """Query: "영등포 맛집 추천"
+---
+Core intent: 영등포 지역 맛집 찾기
+Search query: 영등포 맛집
+---"""
+
+    year_rule = _year_rule(time_sensitive, year_hint)
+    if follow_up:
+        # 후속 질문은 Already covered 추론이 다양화 품질을 좌우하므로 항상 CoT 유지
+        return WEB_SEARCH_FOLLOW_UP_PROMPT.format(year_rule=year_rule, year_example=year_example)
+
+    if cot:
+        output_format = _NEW_QUESTION_COT_FORMAT
+    else:
+        output_format = _NEW_QUESTION_LEAN_FORMAT
+        # 예시도 출력 형식과 맞춰 검색어 줄만 남김
+        year_example = "\n".join(
+            line for line in year_example.splitlines()
+            if line.startswith(("Query:", "Search query:"))
+        )
+    return WEB_SEARCH_NEW_QUESTION_PROMPT.format(
+        year_rule=year_rule, year_example=year_example, output_format=output_format
+    )
+
+
 def _parse_cot_response(response_text: str, fallback_query: str) -> tuple[str, dict]:
     """CoT 응답에서 검색 쿼리와 메타데이터 추출.
 
@@ -135,55 +327,34 @@ def _parse_cot_response(response_text: str, fallback_query: str) -> tuple[str, d
     text = response_text.strip()
 
     # "Search query:" 라인 찾기 (대소문자 무시)
-    query_match = re.search(
-        r'Search query:\s*(.+?)(?:\n|---|$)',
-        text,
-        re.IGNORECASE
-    )
+    query_match = _SEARCH_QUERY_RE.search(text)
 
     if query_match:
         query = query_match.group(1).strip()
         # 따옴표, 대괄호 제거
-        query = re.sub(r'^[\["\']|[\]"\']$', '', query)
-        query = query.strip()
+        query = query.strip("[]\"'").strip()
 
         if query and len(query) <= 100:
             # 메타데이터 추출 (디버깅/로깅용)
             metadata = {}
 
             # Already covered 추출
-            covered_match = re.search(
-                r'Already covered:\s*(.+?)(?:\n|---|$)',
-                text,
-                re.IGNORECASE
-            )
+            covered_match = _COVERED_RE.search(text)
             if covered_match:
                 metadata["already_covered"] = covered_match.group(1).strip()
 
             # Diversify by 추출 (또는 New direction - 하위 호환)
-            diversify_match = re.search(
-                r'(?:Diversify by|New direction|New angle):\s*(.+?)(?:\n|---|$)',
-                text,
-                re.IGNORECASE
-            )
+            diversify_match = _DIVERSIFY_RE.search(text)
             if diversify_match:
                 metadata["diversify_by"] = diversify_match.group(1).strip()
 
             # Core intent 추출 (new_question용)
-            intent_match = re.search(
-                r'Core intent:\s*(.+?)(?:\n|---|$)',
-                text,
-                re.IGNORECASE
-            )
+            intent_match = _CORE_INTENT_RE.search(text)
             if intent_match:
                 metadata["core_intent"] = intent_match.group(1).strip()
 
             # User wants 추출
-            wants_match = re.search(
-                r'User wants:\s*(.+?)(?:\n|---|$)',
-                text,
-                re.IGNORECASE
-            )
+            wants_match = _USER_WANTS_RE.search(text)
             if wants_match:
                 metadata["user_wants"] = wants_match.group(1).strip()
 
@@ -194,8 +365,7 @@ def _parse_cot_response(response_text: str, fallback_query: str) -> tuple[str, d
     if lines:
         last_line = lines[-1]
         # 마크다운 형식 제거
-        last_line = re.sub(r'^[-*]\s*', '', last_line)
-        last_line = re.sub(r'^[\["\']|[\]"\']$', '', last_line)
+        last_line = last_line.lstrip("-* ").strip("[]\"'")
         if last_line and len(last_line) <= 100 and not last_line.startswith('---'):
             return last_line, {"fallback": True}
 
@@ -207,11 +377,7 @@ def _parse_cot_response(response_text: str, fallback_query: str) -> tuple[str, d
 # =============================================================================
 
 WIKIPEDIA_ENHANCE_PROMPT = """You are a Wikipedia search optimizer.
-
-## Input
-- Query: {query}
-- User's request: {context}
-- Conversation history: {history}
+The input (query, user's request, conversation history) is given in the user message.
 
 ## Task
 1. Extract the main entity/topic for Wikipedia search
@@ -224,17 +390,31 @@ WIKIPEDIA_ENHANCE_PROMPT = """You are a Wikipedia search optimizer.
 - User asks "더 알려줘", "자세히": add 5-10 more sentences
 
 ## Output Format (JSON)
-{{"query": "검색어", "sentences": 5}}
+{"query": "검색어", "sentences": 5}
 
 ## Examples
-- Query: "아인슈타인 생년월일" → {{"query": "아인슈타인", "sentences": 3}}
-- Query: "머신러닝의 정의" → {{"query": "머신러닝", "sentences": 5}}
-- Query: "1940년 역사적 사건" → {{"query": "1940년", "sentences": 12}}
-- Query: "한국전쟁", History: "더 자세히 알려줘" → {{"query": "한국전쟁", "sentences": 15}}
+- Query: "아인슈타인 생년월일" → {"query": "아인슈타인", "sentences": 3}
+- Query: "머신러닝의 정의" → {"query": "머신러닝", "sentences": 5}
+- Query: "1940년 역사적 사건" → {"query": "1940년", "sentences": 12}
+- Query: "한국전쟁", History: "더 자세히 알려줘" → {"query": "한국전쟁", "sentences": 15}"""
+
+WIKIPEDIA_ENHANCE_INPUT = """## Input
+- Conversation history: {history}
+- Query: {query}
+- User's request: {context}
 
 Output JSON:"""
 
 
+# 히스토리 시작 경계 간격 (평균 N개 메시지마다 하나)
+_HISTORY_BOUNDARY_MOD = 4
+
+
+def _is_history_boundary(line: str) -> bool:
+    """내용 기반 경계 여부 (프로세스와 무관하게 같은 메시지는 같은 결과)."""
+    return zlib.crc32(line.encode()) % _HISTORY_BOUNDARY_MOD == 0
+
+
 def _format_history_by_intent(
     history: list[dict[str, str]] | None,
     intent: str = "new_question",
@@ -255,41 +435,58 @@ def _format_history_by_intent(
 
     if intent == "new_question":
         # 새 질문: 히스토리 최소화 (직전 맥락 참고용으로만)
-        recent = history[-2:] if len(history) >= 2 else history
         lines = []
-        for msg in recent:
+        for msg in history[-2:]:
             role = "User" if msg.get("role") == "user" else "Assistant"
-            content = msg.get("content", "")[:200]
-            if len(msg.get("content", "")) > 200:
-                content += "..."
+            content = msg.get("content", "")
+            if len(content) > 200:
+                content = content[:200] + "..."
             lines.append(f"[{role}]: {content}")
         return "\n".join(lines) if lines else "(없음)"
 
     elif intent == "follow_up":
-        # 후속 질문: 히스토리 전체 사용 (중복 방지를 위해 최신 것 우선 보존)
-        lines = []
-        total_chars = 0
+        # 후속 질문: 같은 턴의 여러 도구 호출이 같은 히스토리를 포맷하므로 결과 재사용
+        messages = tuple((msg.get("role", ""), msg.get("content", "")) for msg in history)
+        return _format_follow_up_history(messages, max_chars)
 
-        for msg in reversed(history):
-            role = "User" if msg.get("role") == "user" else "Assistant"
-            content = msg.get("content", "")
-            line = f"[{role}]: {content}"
-
-            if total_chars + len(line) > max_chars:
-                # 남은 공간에 맞게 자르기
-                remaining = max_chars - total_chars
-                if remaining > 100:  # 최소 100자는 포함
-                    truncated = content[: remaining - 50] + "..."
-                    lines.insert(0, f"[{role}]: {truncated}")
-                break
+    else:  # clarification, chitchat
+        return "(없음)"
 
-            lines.insert(0, line)  # 순서 유지를 위해 앞에 삽입
-            total_chars += len(line) + 2  # \n\n 고려
 
-        return "\n\n".join(lines) if lines else "(없음)"
+@functools.lru_cache(maxsize=64)
+def _format_follow_up_history(messages: tuple[tuple[str, str], ...], max_chars: int) -> str:
+    """follow_up 히스토리 포맷: 전체를 시간순으로 사용 (길이 초과 시 오래된 메시지부터 제외).
 
-    else:  # clarification, chitchat
-        return "(없음)"
+    Args:
+        messages: (role, content) 튜플 (캐시 키로 쓰기 위해 hashable)
+        max_chars: 최대 문자 수
+
+    Returns:
+        포맷된 히스토리 문자열
+    """
+    lines = [
+        f"[{'User' if role == 'user' else 'Assistant'}]: {content}"
+        for role, content in messages
+    ]
+
+    # max_chars 안에 들어가는 가장 이른 시작 위치
+    # 최신 메시지부터의 누적 길이(구분자 \n\n 포함)에서 이분 탐색 - 마지막 구분자는 제외
+    cumulative = list(accumulate(len(line) + 2 for line in reversed(lines)))
+    start = len(lines) - bisect_right(cumulative, max_chars + 2)
+
+    if start == len(lines):
+        # 최신 메시지 하나도 들어가지 않으면 잘라서라도 포함
+        return lines[-1][: max_chars - 3] + "..."
+
+    if start > 0:
+        # 시작 위치를 내용 기반 경계로 밀어서, 턴이 바뀌어도 앞부분이
+        # 바이트 단위로 동일하게 유지되도록 함 (provider prompt cache 재사용)
+        for idx in range(start, len(lines) - 1):
+            if _is_history_boundary(lines[idx]):
+                start = idx
+                break
+
+    return "\n\n".join(lines[start:])
 
 
 # 기존 함수 유지 (하위 호환성)
@@ -305,11 +502,11 @@ def _parse_wikipedia_response(response_text: str, fallback_query: str) -> tuple[
     # JSON 파싱 시도
     try:
         # 마크다운 코드블록 제거
-        if text.startswith("```"):
-            text = re.sub(r"^```(?:json)?\s*\n?", "", text)
-            text = re.sub(r"\n?```$", "", text)
+        fence_match = _CODEFENCE_RE.match(text)
+        if fence_match:
+            text = fence_match.group(1)
 
-        data = json.loads(text)
+        data = orjson.loads(text)
         query = data.get("query", fallback_query)
         sentences = data.get("sentences", 5)
 
@@ -320,13 +517,13 @@ def _parse_wikipedia_response(response_text: str, fallback_query: str) -> tuple[
 
         return query, sentences
 
-    except (json.JSONDecodeError, ValueError, TypeError):
+    except (orjson.JSONDecodeError, ValueError, TypeError):
         pass
 
     # Fallback: 텍스트에서 쿼리 추출 시도
     # "query": "값" 패턴 찾기
-    query_match = re.search(r'"query"\s*:\s*"([^"]+)"', text)
-    sentences_match = re.search(r'"sentences"\s*:\s*(\d+)', text)
+    query_match = _QUERY_JSON_RE.search(text)
+    sentences_match = _SENTENCES_JSON_RE.search(text)
 
     if query_match:
         query = query_match.group(1)
@@ -335,13 +532,169 @@ def _parse_wikipedia_response(response_text: str, fallback_query: str) -> tuple[
 
     # 최종 fallback: 첫 줄을 쿼리로 사용
     first_line = text.split('\n')[0].strip()
-    first_line = re.sub(r'^["\']|["\']$', '', first_line)
+    first_line = first_line.strip("\"'")
     if first_line and len(first_line) <= 50:
         return first_line, 5
 
     return fallback_query, 5
 
 
+class _EnhanceRequest(NamedTuple):
+    """LLM 호출이 필요한 증강 요청 (sync/async 공용)."""
+
+    messages: list[BaseMessage]
+    cache: CacheBackend | None
+    cache_key: str | None
+    max_tokens: int | None = None
+
+
+def enhance_cache_stats() -> CacheStats:
+    """쿼리 증강 캐시 통계 (Web Search/Wikipedia/묶음 증강 공용)."""
+    return get_cache("query_enhancement").get_stats()
+
+
+def _get_enhancer_llm(request: _EnhanceRequest):
+    llm = get_llm(
+        model=settings.default_model,
+        temperature=0.0,
+    )
+    if request.max_tokens is not None:
+        return llm.bind(max_tokens=request.max_tokens)
+    return llm
+
+
+def _prepare_web_search(
+    query: str,
+    context: str | None,
+    history: list[dict[str, str]] | None,
+    intent: str,
+    time_sensitive: str,
+) -> str | _EnhanceRequest:
+    """Web Search 증강 준비: LLM 없이 결정되면 결과 문자열, 아니면 요청 반환."""
+    has_url, has_year = _scan_query(query)
+    # URL이 포함된 쿼리는 증강하지 않고 그대로 반환 (URL 변형 방지)
+    if has_url:
+        return query.strip()
+
+    # Year hint 계산 (방어적 체크 포함)
+    year_hint = _get_year_hint()
+    # 쿼리에 이미 연도가 있으면 time_sensitive를 specified로 처리
+    if has_year:
+        time_sensitive = "specified"
+
+    if _is_trivial_web_query(query.strip(), context, intent, time_sensitive):
+        return query.strip()
+
+    # follow_up만 히스토리를 프롬프트에 사용
+    history_text = (
+        _format_history_by_intent(history, intent="follow_up")
+        if intent == "follow_up"
+        else ""
+    )
+
+    # 동일 입력의 증강 결과 재사용 (temperature=0)
+    cache = get_cache("query_enhancement") if settings.cache_enabled else None
+    cache_key = None
+    if cache is not None:
+        cache_key = query_enhancement_cache_key(
+            "web", query.strip(), context, history_text, intent, time_sensitive, year_hint
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    current_dt = _current_dt_string()
+    follow_up = intent == "follow_up"
+    cot = settings.query_enhance_cot
+    system_prompt = _build_web_search_system_prompt(follow_up, time_sensitive, year_hint, cot)
+
+    # Intent에 따라 프롬프트와 히스토리 처리 분기
+    if follow_up:
+        # 후속 질문: 전체 히스토리 + 중복 방지 강조 프롬프트
+        input_text = WEB_SEARCH_FOLLOW_UP_INPUT.format(
+            query=query[:200],
+            context=(context or "")[:200],
+            current_datetime=current_dt,
+            history=history_text,
+        )
+    else:
+        # 새 질문: 히스토리 최소화 + 단순 프롬프트
+        input_text = WEB_SEARCH_NEW_QUESTION_INPUT.format(
+            query=query[:200],
+            context=(context or "")[:200],
+            current_datetime=current_dt,
+        )
+
+    messages = [
+        cached_system_message(system_prompt, model=settings.default_model),
+        HumanMessage(content=input_text),
+    ]
+    max_tokens = None if follow_up or cot else _LEAN_MAX_TOKENS
+    return _EnhanceRequest(messages, cache, cache_key, max_tokens)
+
+
+def _stream_web_search(llm, messages: list[BaseMessage]) -> str:
+    """응답을 스트리밍으로 받다가 Search query 줄이 끝나면 생성 중단.
+
+    이후 내용(--- 등)은 파싱에 쓰이지 않으므로 기다리지 않는다.
+    """
+    parts: list[str] = []
+    for chunk in llm.stream(messages):
+        if isinstance(chunk.content, str):
+            parts.append(chunk.content)
+            if "\n" in chunk.content and _SEARCH_QUERY_DONE_RE.search("".join(parts)):
+                break
+    return "".join(parts)
+
+
+async def _astream_web_search(llm, messages: list[BaseMessage]) -> str:
+    """_stream_web_search의 async 버전."""
+    parts: list[str] = []
+    async for chunk in llm.astream(messages):
+        if isinstance(chunk.content, str):
+            parts.append(chunk.content)
+            if "\n" in chunk.content and _SEARCH_QUERY_DONE_RE.search("".join(parts)):
+                break
+    return "".join(parts)
+
+
+def _finish_web_search(request: _EnhanceRequest, response_text: str, query: str) -> str:
+    """Web Search 증강 LLM 응답 처리 (파싱 + 캐시 저장)."""
+    # CoT 응답 파싱
+    enhanced, metadata = _parse_cot_response(response_text, query.strip())
+
+    if settings.query_enhance_cot and metadata:
+        logger.debug("[QueryEnhancer] %s", metadata)
+
+    if not enhanced or len(enhanced) > 100:
+        return query.strip()
+
+    if request.cache is not None and not metadata.get("parse_failed"):
+        request.cache.set(request.cache_key, enhanced)
+
+    return enhanced
+
+
+def _get_semantic_web_search_cache(
+    query: str,
+    context: str | None,
+    intent: str,
+    time_sensitive: str,
+) -> tuple[SemanticCache | None, list[float] | None]:
+    """Web Search 증강용 시맨틱 캐시와 입력 임베딩 반환 (임베딩 실패 시 (None, None)).
+
+    결과가 쿼리뿐 아니라 사용자 요청에도 의존하므로 둘을 함께 임베딩하고,
+    intent/시간 민감도/연도 힌트가 다르면 다른 캐시를 사용한다.
+    """
+    embedding = get_embedding(f"{query.strip()}\n{context or ''}")
+    if embedding is None:
+        return None, None
+    if _has_year_in_query(query):
+        time_sensitive = "specified"
+    name = f"query_enhancement:{intent}:{time_sensitive}:{_get_year_hint()}"
+    return get_semantic_cache(name), embedding
+
+
 def enhance_query_for_web_search(
     query: str,
     context: str | None,
@@ -361,88 +714,48 @@ def enhance_query_for_web_search(
     Returns:
         증강된 검색 쿼리
     """
-    # URL이 포함된 쿼리는 증강하지 않고 그대로 반환 (URL 변형 방지)
-    if _has_url_in_query(query):
-        return query.strip()
-
     try:
-        llm = get_llm(
-            model=settings.default_model,
-            temperature=0.0,
-        )
-
-        current_dt = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        safe_query = query.replace("{", "{{").replace("}", "}}")
-        safe_context = (context or "").replace("{", "{{").replace("}", "}}")
-
-        # Year hint 계산 (방어적 체크 포함)
-        year_hint = _get_year_hint()
-        # 쿼리에 이미 연도가 있으면 time_sensitive를 specified로 처리
-        if _has_year_in_query(query):
-            time_sensitive = "specified"
-
-        # time_sensitive에 따라 year_rule과 year_example 동적 생성
-        if time_sensitive == "current":
-            year_rule = f'- IMPORTANT: Add "{year_hint}" at the START of the search query for recency'
-            year_example = f"""Query: "요즘 핫한 카페"
----
-Core intent: 최근 인기 있는 카페 찾기
-Search query: {year_hint} 인기 카페
----"""
-        elif time_sensitive == "specified":
-            year_rule = "- IMPORTANT: User specified a year/period. PRESERVE it exactly as given. Do NOT add or change the year."
-            year_example = """Query: "2020~2024년 인기 카페"
----
-Core intent: 2020~2024년 사이 인기 있던 카페 찾기
-Search query: 2020~2024년 인기 카페
----"""
-        else:  # none
-            year_rule = ""
-            year_example = """Query: "영등포 맛집 추천"
----
-Core intent: 영등포 지역 맛집 찾기
-Search query: 영등포 맛집
----"""
-
-        # Intent에 따라 프롬프트와 히스토리 처리 분기
-        if intent == "follow_up":
-            # 후속 질문: 전체 히스토리 + 중복 방지 강조 프롬프트
-            history_text = _format_history_by_intent(history, intent="follow_up")
-            prompt = WEB_SEARCH_FOLLOW_UP_PROMPT.format(
-                query=safe_query[:200],
-                context=safe_context[:200],
-                current_datetime=current_dt,
-                history=history_text,
-                year_rule=year_rule,
-                year_example=year_example,
+        request = _prepare_web_search(query, context, history, intent, time_sensitive)
+        if isinstance(request, str):
+            return request
+
+        # 정확히 같은 입력이 없으면 의미가 거의 같은 이전 입력의 결과 재사용
+        semantic_cache, embedding = None, None
+        if settings.cache_semantic_enabled and request.cache is not None and intent != "follow_up":
+            semantic_cache, embedding = _get_semantic_web_search_cache(
+                query, context, intent, time_sensitive
             )
-        else:
-            # 새 질문: 히스토리 최소화 + 단순 프롬프트
-            prompt = WEB_SEARCH_NEW_QUESTION_PROMPT.format(
-                query=safe_query[:200],
-                context=safe_context[:200],
-                current_datetime=current_dt,
-                year_rule=year_rule,
-                year_example=year_example,
-            )
-
-        response = llm.invoke([
-            SystemMessage(content=prompt),
-            HumanMessage(content=f"Query to optimize: {safe_query[:200]}"),
-        ])
-
-        # CoT 응답 파싱
-        enhanced, metadata = _parse_cot_response(response.content, query.strip())
-
-        # 디버깅용 로그 (필요시 활성화)
-        # if metadata:
-        #     print(f"[QueryEnhancer] {intent}: {metadata}")
+            cached = semantic_cache.get(embedding) if semantic_cache is not None else None
+            if cached is not None:
+                request.cache.set(request.cache_key, cached)
+                return cached
+
+        response_text = _stream_web_search(_get_enhancer_llm(request), request.messages)
+        enhanced = _finish_web_search(request, response_text, query)
+        if semantic_cache is not None and enhanced != query.strip():
+            semantic_cache.set(embedding, enhanced)
+        return enhanced
+    except Exception:
+        return query.strip()
 
-        if not enhanced or len(enhanced) > 100:
-            return query.strip()
 
-        return enhanced
+async def aenhance_query_for_web_search(
+    query: str,
+    context: str | None,
+    history: list[dict[str, str]] | None = None,
+    intent: str = "new_question",
+    time_sensitive: str = "none",
+) -> str:
+    """enhance_query_for_web_search의 async 버전.
 
+    여러 쿼리를 asyncio.gather로 동시에 증강할 때 사용 (LLM 왕복이 겹쳐서 진행됨).
+    """
+    try:
+        request = _prepare_web_search(query, context, history, intent, time_sensitive)
+        if isinstance(request, str):
+            return request
+        response_text = await _astream_web_search(_get_enhancer_llm(request), request.messages)
+        return _finish_web_search(request, response_text, query)
     except Exception:
         return query.strip()
 
@@ -477,6 +790,81 @@ def maybe_enhance_query(
     return enhanced, was_changed
 
 
+async def amaybe_enhance_query(
+    query: str,
+    context: str | None,
+    from_previous_step: bool = False,
+    history: list[dict[str, str]] | None = None,
+    intent: str = "new_question",
+    time_sensitive: str = "none",
+) -> tuple[str, bool]:
+    """maybe_enhance_query의 async 버전."""
+    if not context:
+        return query, False
+
+    enhanced = await aenhance_query_for_web_search(query, context, history, intent, time_sensitive)
+    was_changed = (enhanced != query.strip())
+
+    return enhanced, was_changed
+
+
+def _prepare_wikipedia(
+    query: str,
+    context: str | None,
+    history: list[dict[str, str]] | None,
+    intent: str,
+) -> tuple[str, int] | _EnhanceRequest:
+    """Wikipedia 최적화 준비: LLM 없이 결정되면 (query, sentences), 아니면 요청 반환."""
+    if _is_trivial_wikipedia_query(query.strip(), context, intent):
+        return query.strip(), 5
+
+    # Intent에 따라 히스토리 처리
+    history_text = _format_history_by_intent(history, intent)
+
+    # 동일 입력의 최적화 결과 재사용 (temperature=0)
+    cache = get_cache("query_enhancement") if settings.cache_enabled else None
+    cache_key = None
+    if cache is not None:
+        cache_key = query_enhancement_cache_key(
+            "wikipedia", query.strip(), context, history_text, intent
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            optimized, sentences = cached
+            return optimized, sentences
+
+    input_text = WIKIPEDIA_ENHANCE_INPUT.format(
+        query=query[:500],
+        context=(context or "")[:200],
+        history=history_text,
+    )
+
+    messages = [
+        cached_system_message(WIKIPEDIA_ENHANCE_PROMPT, model=settings.default_model),
+        HumanMessage(content=input_text),
+    ]
+    return _EnhanceRequest(messages, cache, cache_key)
+
+
+def _finish_wikipedia(
+    request: _EnhanceRequest,
+    response_text: str,
+    query_stripped: str,
+    intent: str,
+) -> tuple[str, int]:
+    """Wikipedia 최적화 LLM 응답 처리 (파싱 + 캐시 저장)."""
+    optimized, sentences = _parse_wikipedia_response(response_text, query_stripped)
+
+    # follow_up이면 더 많은 sentences 반환 (추가 정보 요청)
+    if intent == "follow_up":
+        sentences = min(20, sentences + 5)
+
+    if request.cache is not None:
+        request.cache.set(request.cache_key, [optimized, sentences])  # JSON 호환 (Redis 백엔드)
+
+    return optimized, sentences
+
+
 def enhance_query_for_wikipedia(
     query: str,
     context: str | None,
@@ -499,37 +887,166 @@ def enhance_query_for_wikipedia(
     query_stripped = query.strip()
 
     try:
-        llm = get_llm(
-            model=settings.default_model,
-            temperature=0.0,
-        )
+        request = _prepare_wikipedia(query, context, history, intent)
+        if isinstance(request, _EnhanceRequest):
+            response = _get_enhancer_llm(request).invoke(request.messages)
+            request = _finish_wikipedia(request, response.content, query_stripped, intent)
 
-        safe_query = query.replace("{", "{{").replace("}", "}}")
-        safe_context = (context or "").replace("{", "{{").replace("}", "}}")
-        # Intent에 따라 히스토리 처리
-        history_text = _format_history_by_intent(history, intent)
+        optimized, sentences = request
+        return optimized, sentences, optimized != query_stripped
 
-        prompt = WIKIPEDIA_ENHANCE_PROMPT.format(
-            query=safe_query[:500],
-            context=safe_context[:200],
-            history=history_text,
-        )
+    except Exception:
+        return query_stripped, 5, False
 
-        response = llm.invoke([
-            SystemMessage(content=prompt),
-            HumanMessage(content="Output JSON:"),
-        ])
 
-        optimized, sentences = _parse_wikipedia_response(
-            response.content, query_stripped
-        )
+async def aenhance_query_for_wikipedia(
+    query: str,
+    context: str | None,
+    from_previous_step: bool = False,
+    history: list[dict[str, str]] | None = None,
+    intent: str = "new_question",
+) -> tuple[str, int, bool]:
+    """enhance_query_for_wikipedia의 async 버전."""
+    query_stripped = query.strip()
 
-        # follow_up이면 더 많은 sentences 반환 (추가 정보 요청)
-        if intent == "follow_up":
-            sentences = min(20, sentences + 5)
+    try:
+        request = _prepare_wikipedia(query, context, history, intent)
+        if isinstance(request, _EnhanceRequest):
+            response = await _get_enhancer_llm(request).ainvoke(request.messages)
+            request = _finish_wikipedia(request, response.content, query_stripped, intent)
 
-        was_changed = (optimized != query_stripped)
-        return optimized, sentences, was_changed
+        optimized, sentences = request
+        return optimized, sentences, optimized != query_stripped
 
     except Exception:
         return query_stripped, 5, False
+
+
+# =============================================================================
+# Bundled Enhancement (Web Search + Wikipedia in one LLM call)
+# =============================================================================
+
+# {year_rule}은 str.replace로 채움 (JSON 예시의 중괄호를 이스케이프하지 않기 위해)
+BUNDLE_ENHANCE_PROMPT = """You optimize search queries for two tools at once: web search and Wikipedia.
+The input (queries, user's request, current time, conversation history) is given in the user message.
+
+## Web search query rules
+- CONCISE IS BETTER: Keep query short (under 30 characters ideal, max 50)
+- Only extract essential terms, remove filler words
+- Convert negative expressions to positive (e.g., "X 알러지 안전한" → "알레르기 프렌들리")
+{year_rule}
+
+## Wikipedia query rules
+- Extract the main entity/topic (an article title)
+- Sentences: simple fact (생년월일, 정의) 3-5, general topic 7-10, broad topic (연도, 역사, 국가) 10-15
+
+## Output Format (JSON, one line, nothing else)
+{"web": "웹 검색어", "wiki": "위키 검색어", "sentences": 5}
+
+## Examples
+- Web: "아인슈타인 최근 재평가 기사", Wikipedia: "아인슈타인 생년월일" → {"web": "아인슈타인 재평가", "wiki": "아인슈타인", "sentences": 3}
+- Web: "영등포 맛집 추천해줘", Wikipedia: "영등포의 역사" → {"web": "영등포 맛집", "wiki": "영등포구", "sentences": 10}"""
+
+BUNDLE_ENHANCE_INPUT = """## Input
+- Conversation history: {history}
+- Web search query: {web_query}
+- Wikipedia query: {wiki_query}
+- User's request: {context}
+- Current time: {current_datetime}
+
+Output JSON:"""
+
+# JSON 한 줄 응답
+_BUNDLE_MAX_TOKENS = 96
+
+
+@functools.lru_cache(maxsize=8)
+def _build_bundle_system_prompt(time_sensitive: str, year_hint: str) -> str:
+    """묶음 증강용 정적 system 프롬프트 (time_sensitive, 연도별로 고정)."""
+    return BUNDLE_ENHANCE_PROMPT.replace("{year_rule}", _year_rule(time_sensitive, year_hint))
+
+
+def _parse_bundle_response(response_text: str) -> tuple[str, str, int] | None:
+    """묶음 증강 응답 파싱. JSON이 아니거나 필드가 없으면 None."""
+    fence_match = _CODEFENCE_RE.match(response_text.strip())
+    text = fence_match.group(1) if fence_match else response_text.strip()
+    try:
+        data = orjson.loads(text)
+        return str(data["web"]).strip(), str(data["wiki"]).strip(), int(data.get("sentences", 5))
+    except (orjson.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def enhance_query_bundle(
+    web_query: str,
+    wiki_query: str,
+    context: str | None,
+    history: list[dict[str, str]] | None = None,
+    intent: str = "new_question",
+    time_sensitive: str = "none",
+) -> bool:
+    """Web Search + Wikipedia 쿼리 증강을 LLM 한 번으로 처리해 각 증강 캐시에 저장.
+
+    두 도구가 같이 실행될 때 도구 실행 전에 호출한다. 이후 각 도구의 증강 함수는
+    같은 캐시 키로 결과를 가져가므로 LLM을 다시 호출하지 않는다.
+    한쪽이라도 LLM이 필요 없으면(fast path, 캐시 히트) 묶지 않고 각자 처리하게 둔다.
+
+    Args:
+        web_query: web_search 도구 입력
+        wiki_query: search_wikipedia 도구 입력
+        context: 사용자 요청
+        history: 대화 히스토리
+        intent: 질문 의도 (follow_up은 다양화 추론이 필요해 묶지 않음)
+        time_sensitive: 시간 민감도 (none, current, specified)
+
+    Returns:
+        묶음 증강 결과를 캐시에 저장했는지 여부
+    """
+    if not settings.cache_enabled or not context or intent == "follow_up":
+        return False
+
+    try:
+        web_request = _prepare_web_search(web_query, context, history, intent, time_sensitive)
+        wiki_request = _prepare_wikipedia(wiki_query, context, history, intent)
+        if not (isinstance(web_request, _EnhanceRequest) and isinstance(wiki_request, _EnhanceRequest)):
+            return False
+
+        if _has_year_in_query(web_query):
+            time_sensitive = "specified"
+        input_text = BUNDLE_ENHANCE_INPUT.format(
+            history=_format_history_by_intent(history, intent),
+            web_query=web_query[:200],
+            wiki_query=wiki_query[:500],
+            context=context[:200],
+            current_datetime=_current_dt_string(),
+        )
+        request = _EnhanceRequest(
+            [
+                cached_system_message(
+                    _build_bundle_system_prompt(time_sensitive, _get_year_hint()),
+                    model=settings.default_model,
+                ),
+                HumanMessage(content=input_text),
+            ],
+            None,
+            None,
+            _BUNDLE_MAX_TOKENS,
+        )
+        response = _get_enhancer_llm(request).invoke(request.messages)
+        parsed = _parse_bundle_response(response.content)
+        if parsed is None:
+            return False
+
+        # 개별 응답 형식으로 넘겨서 검증/캐시 저장 로직을 그대로 재사용
+        web, wiki, sentences = parsed
+        _finish_web_search(web_request, f"Search query: {web}", web_query)
+        _finish_wikipedia(
+            wiki_request,
+            orjson.dumps({"query": wiki, "sentences": sentences}).decode(),
+            wiki_query.strip(),
+            intent,
+        )
+        return True
+
+    except Exception:
+        return False
@@ -5,7 +5,12 @@
 """
 
 import os
-from src.config import settings
+import threading
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+import orjson
+
 from src.tools.query_enhancer import maybe_enhance_query
 
 
@@ -14,6 +19,10 @@ RAG_STORE_TYPE = os.getenv("RAG_STORE_TYPE", "mock")  # mock, opensearch, faiss
 OPENSEARCH_URL = os.getenv("OPENSEARCH_URL", "http://localhost:9200")
 OPENSEARCH_INDEX = os.getenv("OPENSEARCH_INDEX", "langgraph-docs")
 FAISS_INDEX_PATH = os.getenv("FAISS_INDEX_PATH", "./faiss_index")
+# 큰 인덱스는 ingestion 시 IVF 계열(예: index_factory(dim, "IVF4096,PQ64"))로 만들고
+# mmap으로 열면 상주 메모리 없이 프로세스 간 페이지 공유 (IVF 인덱스만 해당)
+FAISS_MMAP = os.getenv("FAISS_MMAP", "false").lower() == "true"
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))  # IVF 인덱스 검색 시 탐색할 클러스터 수
 
 
 def rag_retrieve(
@@ -62,16 +71,22 @@ def _search_mock(query: str, top_k: int) -> str:
     return f"[Mock RAG] '{query}' 검색 결과: 관련 문서를 찾지 못했습니다. (RAG_STORE_TYPE 환경변수 설정 필요)"
 
 
+@lru_cache(maxsize=1)
+def _get_opensearch_client():
+    """OpenSearch 클라이언트 재사용 (연결 풀 유지)."""
+    from opensearchpy import OpenSearch
+
+    return OpenSearch(
+        hosts=[OPENSEARCH_URL],
+        http_compress=True,
+        timeout=30,
+    )
+
+
 def _search_opensearch(query: str, top_k: int) -> str:
     """OpenSearch에서 검색."""
     try:
-        from opensearchpy import OpenSearch
-
-        client = OpenSearch(
-            hosts=[OPENSEARCH_URL],
-            http_compress=True,
-            timeout=30,
-        )
+        client = _get_opensearch_client()
 
         # 벡터 검색 쿼리 (임베딩 필요)
         # 여기서는 간단히 텍스트 매칭 사용
@@ -107,11 +122,61 @@ def _search_opensearch(query: str, top_k: int) -> str:
         return f"OpenSearch 검색 실패: {e}"
 
 
+# 검색 결과에 쓰는 문서 본문 최대 길이
+_DOC_CONTENT_MAX_CHARS = 500
+
+
+class _DocMeta(NamedTuple):
+    """FAISS 메타데이터 한 건 (검색 결과에 쓰는 필드만 보관)."""
+
+    title: str
+    content: str
+
+
+# 로드한 FAISS 인덱스/메타데이터 (파일이 바뀌면 다시 로드)
+_faiss_cache: dict[str, tuple[tuple[float, float], Any, list[_DocMeta]]] = {}
+_faiss_lock = threading.Lock()
+
+
+def _load_metadata(metadata_file: str) -> list[_DocMeta]:
+    """metadata.json을 읽어 필요한 필드만 잘라 둔다 (원본 dict는 바로 해제)."""
+    with open(metadata_file, "rb") as f:
+        records = orjson.loads(f.read())
+    return [
+        _DocMeta(
+            record.get("title", "제목 없음"),
+            record.get("content", "")[:_DOC_CONTENT_MAX_CHARS],
+        )
+        for record in records
+    ]
+
+
+def _load_faiss(index_file: str, metadata_file: str) -> tuple[Any, list[_DocMeta]]:
+    """FAISS 인덱스와 메타데이터 로드 (수정 시각이 같으면 이전 로드 결과 재사용)."""
+    import faiss
+
+    mtimes = (os.path.getmtime(index_file), os.path.getmtime(metadata_file))
+    with _faiss_lock:
+        cached = _faiss_cache.get(index_file)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1], cached[2]
+
+        if FAISS_MMAP:
+            index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        else:
+            index = faiss.read_index(index_file)
+        try:
+            faiss.ParameterSpace().set_index_parameter(index, "nprobe", FAISS_NPROBE)
+        except RuntimeError:
+            pass  # IVF가 아닌 인덱스(IndexFlat 등)는 nprobe 없음
+        metadata = _load_metadata(metadata_file)
+        _faiss_cache[index_file] = (mtimes, index, metadata)
+        return index, metadata
+
+
 def _search_faiss(query: str, top_k: int) -> str:
     """FAISS 인덱스에서 검색."""
     try:
-        import faiss
-        import json
         import numpy as np
 
         index_file = f"{FAISS_INDEX_PATH}/index.faiss"
@@ -120,12 +185,8 @@ def _search_faiss(query: str, top_k: int) -> str:
         if not os.path.exists(index_file):
             return f"FAISS 인덱스 파일이 없습니다: {index_file}"
 
-        # 인덱스 로드
-        index = faiss.read_index(index_file)
-
-        # 메타데이터 로드
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            metadata = json.load(f)
+        # 인덱스 + 메타데이터 로드 (프로세스당 한 번)
+        index, metadata = _load_faiss(index_file, metadata_file)
 
         # 쿼리 임베딩 생성 (OpenAI 임베딩 사용)
         query_embedding = _get_embedding(query)
@@ -142,9 +203,7 @@ def _search_faiss(query: str, top_k: int) -> str:
             if idx < 0 or idx >= len(metadata):
                 continue
             doc = metadata[idx]
-            content = doc.get("content", "")[:500]
-            title = doc.get("title", "제목 없음")
-            results.append(f"[{i+1}] {title}\n{content}")
+            results.append(f"[{i+1}] {doc.title}\n{doc.content}")
 
         if not results:
             return f"'{query}'에 대한 문서를 찾지 못했습니다."
@@ -158,16 +217,7 @@ def _search_faiss(query: str, top_k: int) -> str:
 
 
 def _get_embedding(text: str) -> list[float] | None:
-    """텍스트의 임베딩 벡터 생성."""
-    try:
-        from langchain_openai import OpenAIEmbeddings
-
-        embeddings = OpenAIEmbeddings(
-            base_url=settings.openrouter_base_url,
-            api_key=settings.openrouter_api_key,
-        )
-
-        return embeddings.embed_query(text)
+    """텍스트의 임베딩 벡터 생성 (임베딩 캐시 사용)."""
+    from src.llm import get_embedding
 
-    except Exception:
-        return None
+    return get_embedding(text)
@@ -23,6 +23,9 @@ TOOLS: dict[str, Callable] = {
     "rag_retrieve": rag_retrieve,
 }
 
+# context/history/intent를 주입받는 검색 도구
+_SEARCH_TOOLS: frozenset[str] = frozenset({"web_search", "rag_retrieve", "search_wikipedia"})
+
 
 def get_tool(name: str) -> Callable | None:
     """도구 함수 반환."""
@@ -60,7 +63,7 @@ def run_tool(
     Raises:
         ValueError: 알 수 없는 도구 또는 스키마 검증 실패
     """
-    tool_fn = get_tool(tool_name)
+    tool_fn = TOOLS.get(tool_name)
 
     if tool_fn is None:
         raise ValueError(f"알 수 없는 도구: {tool_name}")
@@ -84,7 +87,7 @@ def run_tool(
     else:
         # 정규화된 dict 입력
         # 검색 도구인 경우 context, from_previous_step, history, intent, time_sensitive 추가
-        if tool_name in ("web_search", "rag_retrieve", "search_wikipedia"):
+        if tool_name in _SEARCH_TOOLS:
             if context:
                 validated_input["context"] = context
             validated_input["from_previous_step"] = from_previous_step
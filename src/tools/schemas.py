@@ -3,6 +3,7 @@
 각 도구의 입력/출력 형태를 정의하여 executor에서 검증.
 """
 
+import functools
 from typing import Any, TypedDict, Literal
 
 
@@ -180,8 +181,9 @@ def validate_tool_input(tool_name: str, tool_input: Any) -> dict[str, Any] | Non
     raise ValueError(f"지원하지 않는 입력 타입: {type(tool_input)}")
 
 
+@functools.cache
 def generate_tool_manifest() -> str:
-    """Planner용 도구 매니페스트 생성.
+    """Planner용 도구 매니페스트 생성 (TOOL_SCHEMAS가 상수이므로 한 번만 생성).
 
     Returns:
         도구 목록 및 스키마 설명 문자열
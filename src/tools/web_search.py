@@ -1,20 +1,44 @@
 """Web search tool with automatic query enhancement."""
 
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from src.config import settings
 from src.tools.query_enhancer import maybe_enhance_query
 
 
+_URL_RE = re.compile(r'https?://[^\s]+')
+
+# URL이 많으면 이 개수씩 나눠 extract API를 동시에 호출
+_EXTRACT_BATCH_SIZE = 4
+_EXTRACT_MAX_WORKERS = 8
+
+
+@lru_cache(maxsize=1)
+def _get_tavily_client(api_key: str):
+    """TavilyClient 재사용 (HTTP keep-alive 연결 유지)."""
+    from tavily import TavilyClient
+
+    return TavilyClient(api_key=api_key)
+
+
 def _extract_urls(query: str) -> list[str]:
     """쿼리에서 모든 URL 추출. 없으면 빈 리스트."""
-    return re.findall(r'https?://[^\s]+', query)
+    if "http" not in query:  # 대부분의 쿼리는 URL이 없으므로 정규식 생략
+        return []
+    return _URL_RE.findall(query)
 
 
 def _extract_webpages(client, urls: list[str]) -> str:
     """Tavily extract API로 웹페이지 내용 추출 (여러 URL 지원)."""
-    response = client.extract(urls=urls)
-    results = response.get("results", [])
+    if len(urls) > _EXTRACT_BATCH_SIZE:
+        batches = [urls[i:i + _EXTRACT_BATCH_SIZE] for i in range(0, len(urls), _EXTRACT_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=min(_EXTRACT_MAX_WORKERS, len(batches))) as pool:
+            responses = list(pool.map(lambda batch: client.extract(urls=batch), batches))
+        results = [r for response in responses for r in response.get("results", [])]
+    else:
+        results = client.extract(urls=urls).get("results", [])
 
     if not results:
         return f"[URL 추출 실패] {', '.join(urls)}에서 내용을 가져올 수 없습니다."
@@ -63,8 +87,7 @@ def web_search(
         raise ValueError("TAVILY_API_KEY가 설정되지 않았습니다.")
 
     try:
-        from tavily import TavilyClient
-        client = TavilyClient(api_key=api_key)
+        client = _get_tavily_client(api_key)
 
         # URL이 포함된 경우 → extract API로 직접 추출 (LLM 안 태움)
         urls = _extract_urls(query)
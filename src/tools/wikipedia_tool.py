@@ -1,8 +1,240 @@
 """Wikipedia search tool."""
 
+import importlib.util
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+
+import httpx
+import orjson
+
+from src.cache import get_cache, get_disk_cache, wikipedia_cache_key
+from src.config import settings
 from src.tools.query_enhancer import enhance_query_for_wikipedia
 
 
+_API_URL = "https://{lang}.wikipedia.org/w/api.php"
+# ko/en 두 호스트에 keep-alive 연결 유지 (동시 step에서도 재핸드셰이크 없음)
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=8, max_connections=16, keepalive_expiry=60)
+# 느린 응답이 에이전트 step 전체를 붙잡지 않도록 호출마다 상한 지정
+_HTTP_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+# 일시적 오류는 짧게 재시도 (연결 실패는 transport, 429/5xx는 _api_query에서 백오프)
+_MAX_RETRIES = 2
+_RETRY_BACKOFF_SECONDS = 0.2
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# 한국어 검색과 동시에 보내는 영어 검색용 (결과를 기다리지 않고 버릴 수 있도록 공유 풀 사용)
+_FALLBACK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wikipedia-en")
+
+
+class _CircuitBreaker:
+    """연속 실패 시 일정 시간 호출을 차단 (장애 중 매 호출이 타임아웃까지 기다리지 않도록).
+
+    차단 시간이 지나면 한 번의 시험 호출만 허용하고, 성공하면 다시 열린다.
+
+    Args:
+        failure_threshold: 차단을 시작하는 연속 실패 횟수
+        cooldown_seconds: 차단 유지 시간(초)
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        self._failure_threshold = failure_threshold
+        self._cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._failures < self._failure_threshold:
+                return True
+            if self._probing or time.monotonic() < self._open_until:
+                return False
+            self._probing = True  # half-open: 시험 호출 하나만 통과
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self._failure_threshold:
+                self._open_until = time.monotonic() + self._cooldown_seconds
+
+
+_breaker = _CircuitBreaker()
+
+# 진행 중인 조회 (같은 검색을 동시에 요청하면 먼저 시작한 호출의 결과를 공유)
+_inflight: dict[str, Future[str]] = {}
+_inflight_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """MediaWiki API용 공유 HTTP 클라이언트 (h2 설치 시 HTTP/2)."""
+    transport = httpx.HTTPTransport(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=_HTTP_LIMITS,
+        retries=_MAX_RETRIES,
+    )
+    return httpx.Client(
+        transport=transport,
+        timeout=_HTTP_TIMEOUT,
+        headers={"User-Agent": f"{settings.app_name} ({settings.app_url})"},
+    )
+
+
+def _prewarm() -> None:
+    """ko/en 호스트에 미리 연결해 두어 첫 검색의 TCP/TLS 핸드셰이크 제거."""
+    client = _get_http_client()
+    for lang in ("ko", "en"):
+        try:
+            client.head(_API_URL.format(lang=lang))
+        except httpx.HTTPError:
+            pass  # 실패해도 첫 검색에서 다시 연결
+
+
+if settings.wikipedia_prewarm:
+    threading.Thread(target=_prewarm, name="wikipedia-prewarm", daemon=True).start()
+
+
+def _api_get(lang: str, params: dict[str, str | int]) -> dict:
+    """MediaWiki API 호출 결과 반환.
+
+    Raises:
+        httpx.HTTPError: 네트워크/HTTP 오류
+        RuntimeError: API 오류 응답
+    """
+    client = _get_http_client()
+    url = _API_URL.format(lang=lang)
+    query_params = {"format": "json", "formatversion": 2, **params}
+    for attempt in range(_MAX_RETRIES + 1):
+        response = client.get(url, params=query_params)
+        if response.status_code not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+            break
+        time.sleep(_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    if "error" in data:
+        raise RuntimeError(data["error"].get("info", "MediaWiki API 오류"))
+    return data
+
+
+def _api_query(lang: str, params: dict[str, str | int]) -> dict:
+    """MediaWiki action=query 호출 결과의 "query" 부분 반환."""
+    return _api_get(lang, {"action": "query", **params}).get("query", {})
+
+
+def _extract_params(sentences: int) -> dict[str, str | int]:
+    """요약(본문 앞 N문장)과 동음이의어 여부를 함께 받는 파라미터."""
+    return {
+        "prop": "extracts|pageprops",
+        "ppprop": "disambiguation",
+        "exsentences": sentences,
+        "explaintext": 1,
+    }
+
+
+def _page_result(page: dict) -> tuple[str, str, bool]:
+    """(제목, 요약, 동음이의어 문서 여부)."""
+    return page.get("title", ""), page.get("extract", ""), "disambiguation" in page.get("pageprops", {})
+
+
+def _search_page(search_query: str, lang: str, sentences: int) -> tuple[str, str, bool] | None:
+    """검색 1위 문서와 요약을 한 번의 호출로 조회 (generator=search). 결과 없으면 None."""
+    result = _api_query(lang, {
+        "generator": "search",
+        "gsrsearch": search_query,
+        "gsrlimit": 1,
+        **_extract_params(sentences),
+    })
+    pages = result.get("pages")
+    return _page_result(pages[0]) if pages else None
+
+
+def _fetch_extract(title: str, lang: str, sentences: int) -> tuple[str, str, bool]:
+    """제목으로 문서 요약 조회 (리다이렉트 해석)."""
+    result = _api_query(lang, {"titles": title, "redirects": 1, **_extract_params(sentences)})
+    return _page_result(result.get("pages", [{"title": title}])[0])
+
+
+# 동음이의어 문서의 목록 항목(* ...)에서 첫 번째 내부 링크 대상
+_OPTION_LINK_RE = re.compile(r"^\*+[^\n\[]*\[\[([^\]|#\n]+)", re.MULTILINE)
+
+
+def _disambiguation_options(title: str, lang: str) -> list[str]:
+    """동음이의어 문서에 나열된 의미들 (문서에 적힌 순서).
+
+    prop=links / generator=links는 제목 알파벳순이라 첫 번째 의미가 아니므로
+    위키텍스트의 목록 항목에서 순서대로 추출한다.
+    """
+    data = _api_get(lang, {"action": "parse", "page": title, "prop": "wikitext", "redirects": 1})
+    wikitext = data.get("parse", {}).get("wikitext", "")
+    options = []
+    for target in _OPTION_LINK_RE.findall(wikitext):
+        target = target.strip()
+        if target and target not in options:
+            options.append(target)
+    return options
+
+
+# 글자 중 한글 비율이 이 이상이면 한국어 문서가 있을 것으로 보고 영어 검색을 미리 보내지 않음
+_HANGUL_RATIO_KO = 0.3
+
+
+@lru_cache(maxsize=1024)
+def _is_hangul_query(search_query: str) -> bool:
+    """검색어가 한글 위주인지 확인 (한글 음절 / 전체 글자)."""
+    letters = [ch for ch in search_query if ch.isalpha()]
+    if not letters:
+        return False
+    hangul = sum("\uac00" <= ch <= "\ud7a3" for ch in letters)
+    return hangul / len(letters) > _HANGUL_RATIO_KO
+
+
+def _lookup(search_query: str, lang: str, sentences: int) -> str:
+    """Wikipedia 검색 + 요약 (쿼리 prefix 제외한 본문 반환).
+
+    Raises:
+        Exception: 네트워크/API 오류 (캐시하지 않도록 호출자에서 처리)
+    """
+    # 검색 + 첫 번째 결과의 요약을 한 번에 조회 (LLM이 결정한 sentences 수 사용)
+    # 한글 위주가 아닌 검색어는 한국어 결과가 없을 가능성이 크므로
+    # 영어 검색을 미리 보내 두고 한국어 검색 (지연 = max(ko, en))
+    fallback = lang == "ko"
+    en_future = None
+    if fallback and not _is_hangul_query(search_query):
+        en_future = _FALLBACK_POOL.submit(_search_page, search_query, "en", sentences)
+    page = _search_page(search_query, lang, sentences)
+
+    # 한국어 결과 없으면 영어 결과 사용 (있으면 영어 검색 결과는 버림)
+    if page is None and fallback:
+        page = en_future.result() if en_future is not None else _search_page(search_query, "en", sentences)
+        lang = "en"
+
+    if page is None:
+        return f"'{search_query}'에 대한 Wikipedia 결과가 없습니다."
+
+    title, summary, is_disambiguation = page
+    if not is_disambiguation:
+        lang_label = "한국어" if lang == "ko" else "English"
+        return f"[{title}] ({lang_label} Wikipedia)\n{summary}"
+
+    # 동음이의어인 경우 첫 번째 옵션 시도 (그것도 동음이의어/없는 문서면 의미 목록 반환)
+    options = _disambiguation_options(title, lang)
+    if options:
+        option_title, option_summary, option_is_disambiguation = _fetch_extract(options[0], lang, sentences)
+        if option_summary and not option_is_disambiguation:
+            return f"[{option_title}]\n{option_summary}"
+    return f"'{search_query}'는 여러 의미가 있습니다: {', '.join(options[:5]) or title}"
+
+
 def search_wikipedia(
     query: str,
     lang: str = "ko",
@@ -31,41 +263,56 @@ def search_wikipedia(
         query, context, from_previous_step, history, intent
     )
 
-    # 결과 출력에 쿼리 정보 포함 (항상)
+    # 결과 출력에 쿼리 정보 포함 (항상, 캐시 적중 시에도 현재 호출 기준)
     original_preview = query[:50] + "..." if len(query) > 50 else query
     if was_changed:
         prefix = f"[Wikipedia 쿼리] {original_preview} → {search_query} (sentences={sentences})\n\n"
     else:
         prefix = f"[Wikipedia 쿼리] {search_query} (sentences={sentences})\n\n"
 
-    try:
-        import wikipedia
-
-        # 한국어로 먼저 시도
-        wikipedia.set_lang(lang)
-        search_results = wikipedia.search(search_query, results=3)
+    # 같은 최종 검색어의 결과 재사용 (Wikipedia 요약은 자주 바뀌지 않음)
+    # 메모리 캐시 → 디스크 캐시(설정 시) → HTTP 순으로 조회
+    cache = get_cache("wikipedia") if settings.cache_enabled else None
+    disk_cache = get_disk_cache("wikipedia") if settings.cache_enabled else None
+    cache_key = wikipedia_cache_key(lang, search_query, sentences)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is None and disk_cache is not None:
+            cached = disk_cache.get(cache_key)
+            if cached is not None:
+                cache.set(cache_key, cached)
+        if cached is not None:
+            return prefix + cached
 
-        # 한국어 결과 없으면 영어로 시도
-        if not search_results and lang == "ko":
-            wikipedia.set_lang("en")
-            search_results = wikipedia.search(search_query, results=3)
-            if search_results:
-                lang = "en"
+    if not _breaker.allow():
+        return "Wikipedia 일시 불가: 최근 요청이 연속으로 실패해 잠시 호출을 중단했습니다."
 
-        if not search_results:
-            return prefix + f"'{search_query}'에 대한 Wikipedia 결과가 없습니다."
+    # 병렬 step들이 같은 검색어를 동시에 조회하면 HTTP 요청은 한 번만 보냄
+    with _inflight_lock:
+        future = _inflight.get(cache_key)
+        owner = future is None
+        if owner:
+            future = _inflight[cache_key] = Future()
 
-        # 첫 번째 결과의 요약 가져오기 (LLM이 결정한 sentences 수 사용)
+    if owner:
         try:
-            summary = wikipedia.summary(search_results[0], sentences=sentences)
-            lang_label = "한국어" if lang == "ko" else "English"
-            return prefix + f"[{search_results[0]}] ({lang_label} Wikipedia)\n{summary}"
-        except wikipedia.DisambiguationError as e:
-            # 동음이의어인 경우 첫 번째 옵션 시도
-            if e.options:
-                summary = wikipedia.summary(e.options[0], sentences=sentences)
-                return prefix + f"[{e.options[0]}]\n{summary}"
-            return prefix + f"'{search_query}'는 여러 의미가 있습니다: {', '.join(e.options[:5])}"
+            body = _lookup(search_query, lang, sentences)
+        except Exception as e:
+            _breaker.record_failure()
+            future.set_exception(e)
+        else:
+            _breaker.record_success()
+            if cache is not None:
+                cache.set(cache_key, body)
+            if disk_cache is not None:
+                disk_cache.set(cache_key, body)
+            future.set_result(body)
+        finally:
+            with _inflight_lock:
+                del _inflight[cache_key]
 
+    try:
+        body = future.result()
     except Exception as e:
         return f"Wikipedia 검색 실패: {e}"
+    return prefix + body